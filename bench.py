@@ -0,0 +1,192 @@
+"""
+Offline benchmarks on synthetic game histories (no Sheets access needed).
+
+    python bench.py mirror --games 100000
+    python bench.py cube --games 100000
+    python bench.py pbs --games 100000
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+import pandas as pd
+
+LOCATIONS = ["Kai Tak", "Mong Kok", "Tsuen Wan", "Causeway Bay"]
+
+def _roll(rng, left: int) -> int:
+    # roughly league-average: strikes ~25%, spares ~40%
+    if left == 10 and rng.random() < 0.25:
+        return 10
+    return min(left, max(0, int(rng.gauss(left * 0.75, 2))))
+
+def synthetic_game(rng: random.Random) -> list[str]:
+    """21 per-throw symbols as stored in Bowling-full ("" for unused boxes)."""
+    sym = lambda p, first: "X" if p == 10 and first else ("-" if p == 0 else str(p))
+    throws = []
+    for f in range(10):
+        a = _roll(rng, 10)
+        if a == 10 and f < 9:
+            throws += ["X", ""]
+            continue
+        if a == 10:
+            b = _roll(rng, 10)
+            c = _roll(rng, 10 if b == 10 else 10 - b)
+            throws += ["X", sym(b, True),
+                       sym(c, True) if b == 10 else ("/" if b + c == 10 else sym(c, False))]
+            continue
+        b = _roll(rng, 10 - a)
+        throws += [sym(a, True), "/" if a + b == 10 else sym(b, False)]
+        if f == 9:
+            throws.append(sym(_roll(rng, 10), True) if a + b == 10 else "")
+    return throws
+
+def synthetic_history(n_games: int, seed: int = 0) -> tuple[list[dict], list[dict]]:
+    """(Bowling, Bowling-full) records shaped like get_all_records() output."""
+    from mirror import THROW_COLS
+    from result_ocr.scoring import Game
+    rng = random.Random(seed)
+    sessions, full = [], []
+    day, game_no = date(2020, 1, 1), 0
+    loc = rng.choice(LOCATIONS)
+    for _ in range(n_games):
+        if game_no >= rng.randint(3, 10):
+            day += timedelta(days=rng.randint(1, 4))
+            loc, game_no = rng.choice(LOCATIONS), 0
+        game_no += 1
+        throws = synthetic_game(rng)
+        gs = "".join(throws)
+        s = Game(gs).stats()
+        sessions.append({"Date": day.strftime("%d/%m/%Y"), "Location": loc, "Game": game_no,
+                         "Spares": s["Spares"], "Strikes": s["Strikes"],
+                         "Pins": s["Pins"], "Total": s["Total"]})
+        full.append({"Date": day.strftime("%Y/%m/%d"), "Location": loc, "Game": game_no,
+                     **dict(zip(THROW_COLS, throws)), "Game String": gs})
+    return sessions, full
+
+def _measure(fn):
+    """(result, seconds, peak traced MB); timed and traced in separate calls."""
+    t = time.perf_counter()
+    fn()
+    secs = time.perf_counter() - t
+    tracemalloc.start()
+    out = fn()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return out, secs, peak
+
+def bench_mirror(n_games: int):
+    import mirror
+    sessions, full = synthetic_history(n_games)
+    mirror.MIRROR_DIR = Path(tempfile.mkdtemp())
+    print(f"{n_games} games{'':14}  time     peak MB  frame MB")
+    for name, records in [("Bowling", sessions), ("Bowling-full", full)]:
+        # old path: list of dicts from get_all_records -> DataFrame -> typed
+        df, secs, peak = _measure(lambda: mirror.SHEETS[name][1](pd.DataFrame(records)))
+        mem = df.memory_usage(deep=True).sum() / 2**20
+        print(f"{name:<13} records  {secs:7.3f}s {peak:9.1f} {mem:9.1f}")
+        mirror.store(name, records)
+        df, secs, peak = _measure(lambda: pd.read_parquet(mirror._path(name), memory_map=True))
+        mem = df.memory_usage(deep=True).sum() / 2**20
+        size = mirror._path(name).stat().st_size / 2**20
+        print(f"{name:<13} parquet  {secs:7.3f}s {peak:9.1f} {mem:9.1f}  ({size:.1f} MB on disk)")
+
+def bench_cube(n_games: int, repeats: int = 50):
+    """Per filter change: mask + groupby over raw games vs summing cube cells."""
+    import numpy as np
+    import mirror
+    from cube import Cube, METRICS, BIN
+    from data import filter_sessions
+    sessions, _ = synthetic_history(n_games)
+    df = mirror._type_sessions(pd.DataFrame(sessions))
+    cube, build, peak = _measure(lambda: Cube.from_frame(df))
+    print(f"{n_games} games -> {len(cube.n)} cells, built in {build:.3f}s "
+          f"(peak {peak:.1f} MB, hist {cube.hist.nbytes / 2**20:.1f} MB)")
+
+    rng = random.Random(1)
+    days = sorted(df["Date"].unique())
+    filters = []
+    for _ in range(repeats):
+        a, b = sorted(rng.sample(days, 2))
+        filters.append((a, b, rng.choice(["All"] + LOCATIONS)))
+
+    def raw(a, b, loc):
+        filt = filter_sessions(df, a, b, loc)
+        return (filt.groupby("Date")[METRICS].mean(), filt[METRICS].mean(), filt[METRICS].std(),
+                filt["Total"].describe()[["min", "25%", "50%", "75%", "max"]])
+
+    def cells(a, b, loc):
+        return (cube.by_date(a, b, loc), cube.mean(a, b, loc), cube.std(a, b, loc),
+                cube.describe(a, b, loc))
+
+    err = []
+    for name, fn in [("raw rows", raw), ("cube", cells)]:
+        secs = []
+        for f in filters:
+            t = time.perf_counter()
+            out = fn(*f)
+            secs.append(time.perf_counter() - t)
+            if name == "cube":
+                err.append(np.abs(out[3].to_numpy() - raw(*f)[3].to_numpy()).max())
+        print(f"{name:<9} median {np.median(secs) * 1000:7.2f} ms, "
+              f"p90 {np.percentile(secs, 90) * 1000:7.2f} ms per filter change")
+    print(f"quartiles: max abs error {max(err):.2f} pins (buckets of {BIN})")
+
+def bench_pbs(n_games: int, repeats: int = 50):
+    """Per PBs view: max + mask per metric and a sort over raw games vs the PB index."""
+    import numpy as np
+    import mirror
+    from pbs import PBIndex
+    from cube import METRICS
+    from data import filter_sessions
+    sessions, _ = synthetic_history(n_games)
+    df = mirror._type_sessions(pd.DataFrame(sessions))
+    index, build, peak = _measure(
+        lambda: PBIndex.from_frame(df, METRICS, {"200+": df["Total"] >= 200}))
+    print(f"{n_games} games indexed in {build:.3f}s (peak {peak:.1f} MB)")
+
+    rng = random.Random(1)
+    days = sorted(df["Date"].unique())
+    filters = []
+    for _ in range(repeats):
+        a, b = sorted(rng.sample(days, 2))
+        filters.append((a, b, rng.choice(["All"] + LOCATIONS)))
+
+    def raw(a, b, loc):
+        filt = filter_sessions(df, a, b, loc)
+        best = [filt[filt[m] == filt[m].max()]["Date"].iloc[0] for m in METRICS]
+        return best, filt.nlargest(10, "Total", keep="first")["Total"].tolist()
+
+    def indexed(a, b, loc):
+        best = [index.top(m, 1, loc, a, b)["Date"].iloc[0] for m in METRICS]
+        index.streak("200+", loc, a, b)
+        return best, index.top("Total", 10, loc, a, b)["Total"].astype(int).tolist()
+
+    for name, fn in [("raw rows", raw), ("index", indexed)]:
+        secs = []
+        for f in filters:
+            t = time.perf_counter()
+            out = fn(*f)
+            secs.append(time.perf_counter() - t)
+            assert name == "raw rows" or out == raw(*f)
+        print(f"{name:<9} median {np.median(secs) * 1000:7.2f} ms, "
+              f"p90 {np.percentile(secs, 90) * 1000:7.2f} ms per PBs view")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("mirror", help="get_all_records path vs Parquet mirror cold start")
+    p.add_argument("--games", type=int, default=100_000)
+    p = sub.add_parser("cube", help="stats_ui filter changes: raw rows vs (Date, Location) cube")
+    p.add_argument("--games", type=int, default=100_000)
+    p = sub.add_parser("pbs", help="PBs tab: per-metric scans vs the personal-best index")
+    p.add_argument("--games", type=int, default=100_000)
+    args = ap.parse_args()
+    if args.cmd == "mirror":
+        bench_mirror(args.games)
+    elif args.cmd == "cube":
+        bench_cube(args.games)
+    elif args.cmd == "pbs":
+        bench_pbs(args.games)
@@ -1,26 +1,36 @@
-import re
+import numpy as np
 import pandas as pd
+from result_ocr.scoring import encode_games
 
-def spare_transition_df(game_strings: list[str]) -> pd.DataFrame:
-    records = []
-    for game_idx, gs in enumerate(game_strings):
-        rolls = []
-        for ch in gs:
-            if ch == "X":    rolls.append(10)
-            elif ch == "/":  rolls.append(10 - rolls[-1])
-            elif ch in "-F": rolls.append(0)
-            else:            rolls.append(int(ch))
+SPARE, STRIKE = ord("/"), ord("X")
+
+def _after(rolls, lengths, g, i):
+    """Roll i of game g where the string has one, else NaN (int when none is missing)."""
+    ok = i < lengths[g]
+    vals = rolls[g, np.minimum(i, rolls.shape[1] - 1)]
+    return vals.astype(np.int64) if ok.all() else np.where(ok, vals, np.nan)
+
+def transition_events(game_strings) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Spare and strike bonus events of every game, from one encoding: every
+    "/" and every "X" in the strings (10th-frame fill balls included) is
+    an event, and bonus rolls past the end of the string are missing.
+    Same rows as `spare_transition_df` / `strike_transition_df`.
+    """
+    # the events include 10th-frame fill balls, so they are found on the
+    # characters rather than on score_encoded's per-frame Strike/Spare
+    chars, rolls, lengths = encode_games(game_strings)
+    g, i = np.nonzero(chars == SPARE)
+    spares = pd.DataFrame({"GameIndex": g, "first_throw": rolls[g, i - 1].astype(np.int64),
+                           "bonus_throw": _after(rolls, lengths, g, i + 1)})
+    g, i = np.nonzero(chars == STRIKE)
+    strikes = pd.DataFrame({"GameIndex": g, "bonus1": _after(rolls, lengths, g, i + 1),
+                            "bonus2": _after(rolls, lengths, g, i + 2)})
+    return spares, strikes
 
-        for i, ch in enumerate(gs):
-            if ch == "/":
-                first = rolls[i-1]
-                bonus = rolls[i+1] if i+1 < len(rolls) else None
-                records.append({
-                    "GameIndex":  game_idx,
-                    "first_throw": first,
-                    "bonus_throw": bonus
-                })
-    return pd.DataFrame(records)
+def spare_transition_df(game_strings: list[str]) -> pd.DataFrame:
+    """One row per spare: GameIndex, first_throw, bonus_throw (the next roll)."""
+    return transition_events(game_strings)[0]
 
 
 def strike_transition_df(game_strings: list[str]) -> pd.DataFrame:
@@ -30,36 +40,15 @@ def strike_transition_df(game_strings: list[str]) -> pd.DataFrame:
       - bonus2: second bonus roll
     Returns a DataFrame one row per strike.
     """
-    records = []
-    for game_idx, gs in enumerate(game_strings):
-        rolls = []
-        for ch in gs:
-            if ch == 'X':
-                rolls.append(10)
-            elif ch == '/':
-                rolls.append(10 - rolls[-1])
-            elif ch in '-F':
-                rolls.append(0)
-            else:
-                rolls.append(int(ch))
-        # scan for strikes
-        for i, ch in enumerate(gs):
-            if ch == 'X':
-                b1 = rolls[i+1] if i+1 < len(rolls) else None
-                b2 = rolls[i+2] if i+2 < len(rolls) else None
-                records.append({"GameIndex": game_idx, "bonus1": b1, "bonus2": b2})
-                i += 1
-            else:
-                i += 1 if ch=='X' else 2  # skip two rolls for non-strike
-    return pd.DataFrame(records)
+    return transition_events(game_strings)[1]
 
 import matplotlib.pyplot as plt
-import numpy as np
 from typing import List
 def plot_spare_bonus_distribution(
-    game_strings: List[str], max_pin: int = 10
+    game_strings: List[str], max_pin: int = 10, events: pd.DataFrame | None = None
 ) -> plt.Figure:
-    df = spare_transition_df(game_strings)
+    """Pass the already-extracted `events` to skip parsing `game_strings`."""
+    df = spare_transition_df(game_strings) if events is None else events
     # drop missing bonus rows
     bonuses = df["bonus_throw"].dropna().astype(int)
 
@@ -79,9 +68,10 @@ def plot_spare_bonus_distribution(
 
 
 def plot_strike_bonus_distributions(
-    game_strings: List[str], max_pin: int = 10
+    game_strings: List[str], max_pin: int = 10, events: pd.DataFrame | None = None
 ) -> plt.Figure:
-    df = strike_transition_df(game_strings)
+    """Pass the already-extracted `events` to skip parsing `game_strings`."""
+    df = strike_transition_df(game_strings) if events is None else events
 
     # only keep strikes with both bonus1 and bonus2 measured
     valid = df.dropna(subset=["bonus1", "bonus2"])
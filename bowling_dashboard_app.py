@@ -1,15 +1,29 @@
 import streamlit as st
-from ocr_ui import session_input_tab, compute_bowling_stats
+from ocr_ui import session_input_tab, bulk_input_tab, compute_bowling_stats
 from stats_ui import stats_tabs
 # from regression_ui import regression_tabs
 from prof_ui import professional_tab
-from sheets import push_session_data, push_ground_truth, sync_aggregates_from_full
+from sheets import push_session_data, push_ground_truth, sync_aggregates_from_full, begin_render, api_calls, flush_writes
+from write_queue import pending, parked, requeue_parked
 from data import load_sessions, filter_sessions
+from cache import stats as cache_stats
 import pandas as pd
 
 st.set_page_config("🎳 Andrew's Dashboard")
 st.title("🎳 Bowling Footsteps")
+begin_render()
+flush_writes()
 sync_aggregates_from_full()
+queued = sum(len(e["rows"]) for e in pending())
+if queued and st.sidebar.button(f"⬆️ Upload {queued} queued rows now"):
+    flush_writes(force=True)
+    st.rerun()
+stuck = sum(len(e["rows"]) for e in parked())
+if stuck:
+    st.sidebar.warning(f"{stuck} rows were rejected by the sheet: {parked()[-1]['reason']}")
+    if st.sidebar.button("↩️ Re-queue rejected rows"):
+        requeue_parked()
+        st.rerun()
 # Tab: add session
 tabs = st.tabs(["➕ Process Session",
                 "📈 Stats",
@@ -17,7 +31,11 @@ tabs = st.tabs(["➕ Process Session",
                 "🏅 Professional"
                 ])
 with tabs[0]:
-    session_input_tab()
+    mode = st.radio("Input", ["Single game", "Whole session"], horizontal=True)
+    if mode == "Single game":
+        session_input_tab()
+    else:
+        bulk_input_tab()
 
 with tabs[1]:
     stats_tabs()
@@ -26,4 +44,8 @@ with tabs[1]:
 #    regression_tabs()
 
 with tabs[2]:
-    professional_tab()
\ No newline at end of file
+    professional_tab()
+
+st.sidebar.caption(f"Sheets API calls this render: {api_calls()}")
+cs = cache_stats()
+st.sidebar.caption(f"Read cache: {cs['hits']} hits / {cs['misses']} misses ({cs['hit_rate']:.0%})")
\ No newline at end of file
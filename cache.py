@@ -0,0 +1,57 @@
+"""
+In-process TTL cache for sheet reads, invalidated by tag whenever we write.
+
+Tags are worksheet names ("Bowling", "Bowling-full"). Cached values are
+shared between reruns and sessions, so treat them as read-only.
+"""
+import threading
+import time
+from functools import wraps
+
+DEFAULT_TTL = 300  # seconds
+
+_entries = {}    # key -> (tag, expires_at, value)
+_listeners = {}  # tag -> [callback(tag)]
+_counters = {"hits": 0, "misses": 0, "invalidations": 0}
+_lock = threading.Lock()
+
+def cached(tag: str, ttl: float = DEFAULT_TTL):
+    """Cache fn(*args) for `ttl` seconds or until `invalidate(tag)`."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (tag, fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            with _lock:
+                hit = _entries.get(key)
+                if hit and hit[1] > time.monotonic():
+                    _counters["hits"] += 1
+                    return hit[2]
+                _counters["misses"] += 1
+            value = fn(*args, **kwargs)
+            with _lock:
+                _entries[key] = (tag, time.monotonic() + ttl, value)
+            return value
+        return wrapper
+    return deco
+
+def invalidate(*tags: str):
+    """Drop every entry under `tags` and notify their listeners."""
+    with _lock:
+        for key in [k for k, e in _entries.items() if e[0] in tags]:
+            del _entries[key]
+        _counters["invalidations"] += 1
+    for tag in tags:
+        for cb in _listeners.get(tag, []):
+            cb(tag)
+
+def on_invalidate(tag: str, callback):
+    """Register callback(tag) to run after `invalidate(tag)`."""
+    _listeners.setdefault(tag, []).append(callback)
+
+def stats() -> dict:
+    """Hit/miss counters plus the number of live entries."""
+    with _lock:
+        out = dict(_counters, entries=len(_entries))
+    lookups = out["hits"] + out["misses"]
+    out["hit_rate"] = out["hits"] / lookups if lookups else 0.0
+    return out
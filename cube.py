@@ -0,0 +1,137 @@
+"""
+Pre-aggregated (Date, Location) cube of the Bowling sessions: per cell the
+game count, per metric the count of values, their sums and sums of
+squares, min/max Total and a histogram of Total in BIN-pin buckets.
+Blank (NaN) values are left out, like pandas `mean()` does. Date-range and location filters
+sum a contiguous run of cells instead of masking every game.
+
+    cube = Cube.from_frame(load_sessions())
+    cube.by_date(start, end, "Kai Tak")          # per-day means (Trends)
+    cube.mean(start, end), cube.std(start, end)  # exact
+    cube.describe(start, end)                    # min/quartiles/max, quartiles to ~BIN/2
+
+    python bench.py cube --games 100000
+"""
+import numpy as np
+import pandas as pd
+
+METRICS = ["Spares", "Strikes", "Pins", "Total"]
+BIN = 5              # pins per Total histogram bucket
+MAX_TOTAL = 300
+ALL = "All"
+
+class Cube:
+    def __init__(self, metrics, dates, locations, codes, n, counts, sums, squares, lo, hi, hist):
+        self.metrics = list(metrics)
+        self.dates = dates          # (cells,) datetime64[D], ascending
+        self.days = pd.to_datetime(dates).date  # the same as datetime.date, for indexes
+        self.locations = locations  # code -> location name
+        self.codes = codes          # (cells,) location code
+        self.n = n                  # (cells,) games
+        self.counts, self.sums, self.squares = counts, sums, squares  # (cells, metrics)
+        self.lo, self.hi, self.hist = lo, hi, hist  # min/max Total, (cells, bins) counts
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, metrics: list[str] = METRICS) -> "Cube":
+        """One pass over the games: sort by (Date, Location) and reduce runs."""
+        df = df.dropna(subset=["Date"])
+        loc = df["Location"].astype("category")
+        codes = loc.cat.codes.to_numpy()
+        days = pd.to_datetime(df["Date"]).to_numpy().astype("datetime64[D]")
+        order = np.lexsort((codes, days))
+        days, codes = days[order], codes[order]
+        vals = df[metrics].to_numpy(float)[order]
+        known = ~np.isnan(vals)
+        new = np.r_[True, (days[1:] != days[:-1]) | (codes[1:] != codes[:-1])]
+        starts = np.flatnonzero(new)
+        cell = np.cumsum(new) - 1
+        total = vals[:, metrics.index("Total")]
+        scored = known[:, metrics.index("Total")]
+        hist = np.zeros((len(starts), MAX_TOTAL // BIN + 1), np.uint16)
+        np.add.at(hist, (cell[scored], np.clip(total[scored], 0, MAX_TOTAL).astype(int) // BIN), 1)
+        vals = np.nan_to_num(vals)
+
+        def reduce(ufunc, a):
+            return ufunc.reduceat(a, starts, axis=0) if len(starts) else a[:0]
+        return cls(
+            metrics, dates=days[starts], locations=list(loc.cat.categories), codes=codes[starts],
+            n=np.diff(np.r_[starts, len(days)]),
+            counts=reduce(np.add, known.astype(np.int64)),
+            sums=reduce(np.add, vals),
+            squares=reduce(np.add, vals ** 2),
+            # fmin/fmax skip NaN; a cell without any Total stays NaN
+            lo=reduce(np.fmin, total),
+            hi=reduce(np.fmax, total),
+            hist=hist,
+        )
+
+    def cells(self, start=None, end=None, location=ALL) -> np.ndarray:
+        """Indices of the cells in [start, end] (dates inclusive) at `location`."""
+        i = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, "D"), "left")
+        j = len(self.dates) if end is None else \
+            np.searchsorted(self.dates, np.datetime64(end, "D"), "right")
+        idx = np.arange(i, max(i, j))
+        if location not in (None, ALL):
+            code = self.locations.index(location) if location in self.locations else -1
+            idx = idx[self.codes[idx] == code]
+        return idx
+
+    def count(self, start=None, end=None, location=ALL) -> int:
+        return int(self.n[self.cells(start, end, location)].sum())
+
+    def mean(self, start=None, end=None, location=ALL) -> pd.Series:
+        c = self.cells(start, end, location)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(self.sums[c].sum(0) / self.counts[c].sum(0), index=self.metrics)
+
+    def std(self, start=None, end=None, location=ALL) -> pd.Series:
+        """Sample standard deviation (ddof=1), like pandas."""
+        c = self.cells(start, end, location)
+        n, s, q = self.counts[c].sum(0), self.sums[c].sum(0), self.squares[c].sum(0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (q - s * s / n) / (n - 1)
+        return pd.Series(np.sqrt(np.maximum(var, 0)), index=self.metrics)
+
+    def by_date(self, start=None, end=None, location=ALL) -> pd.DataFrame:
+        """Per-date means of every metric (all matching locations pooled)."""
+        c = self.cells(start, end, location)
+        if not len(c):
+            return pd.DataFrame(columns=self.metrics, index=pd.Index([], name="Date"))
+        days = self.dates[c]
+        first = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        sums = np.add.reduceat(self.sums[c], first, axis=0)
+        n = np.add.reduceat(self.counts[c], first, axis=0)
+        index = pd.Index(self.days[c[first]], name="Date")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame(sums / n, index=index, columns=self.metrics)
+
+    def histogram(self, start=None, end=None, location=ALL) -> tuple[np.ndarray, np.ndarray]:
+        """(counts, bin edges) of Total over the selection, BIN pins per bucket."""
+        counts = self.hist[self.cells(start, end, location)].sum(0, dtype=np.int64)
+        return counts, np.arange(len(counts) + 1) * BIN
+
+    def quantiles(self, qs, start=None, end=None, location=ALL) -> np.ndarray:
+        """Quantiles of Total, interpolated linearly inside each bucket."""
+        c = self.cells(start, end, location)
+        counts = self.hist[c].sum(0, dtype=np.int64)
+        n = counts.sum()
+        if not n:
+            return np.full(len(qs), np.nan)
+        lo, hi = np.nanmin(self.lo[c]), np.nanmax(self.hi[c])
+        cum = np.r_[0, np.cumsum(counts)]
+        out = []
+        for q in qs:
+            rank = q * (n - 1) + 0.5          # rank of the q-th value, counted from 0
+            b = min(np.searchsorted(cum, rank, "right") - 1, len(counts) - 1)
+            frac = (rank - cum[b]) / counts[b] if counts[b] else 0.0
+            out.append(np.clip(b * BIN + frac * BIN, lo, hi))
+        return np.array(out)
+
+    def describe(self, start=None, end=None, location=ALL) -> pd.Series:
+        """Min / Q1 / median / Q3 / max of Total; min and max are exact."""
+        c = self.cells(start, end, location)
+        if not self.hist[c].sum():
+            return pd.Series(np.nan, index=["min", "25%", "50%", "75%", "max"])
+        q1, med, q3 = self.quantiles([0.25, 0.5, 0.75], start, end, location)
+        return pd.Series([np.nanmin(self.lo[c]), q1, med, q3, np.nanmax(self.hi[c])],
+                         index=["min", "25%", "50%", "75%", "max"])
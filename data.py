@@ -1,14 +1,126 @@
+import threading
+import numpy as np
 import pandas as pd
-import streamlit as st
-from sheets import get_session_sheet
+from cache import cached
+import facts
+from rolling import RollingStats
+from cube import Cube
+from pbs import PBIndex, longest_run
+from mirror import read_sheet
 
-#@st.cache_data(show_spinner=False)
+@cached("Bowling")
 def load_sessions() -> pd.DataFrame:
-    records = get_session_sheet().get_all_records()
-    df = pd.DataFrame(records)
-    df = df.dropna(subset=["Date"])
-    df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, errors="coerce").dt.date
-    return df.dropna(subset=["Date"])
+    # typed (Date parsed, empty dates dropped) by the local mirror
+    return read_sheet("Bowling")
+
+@cached("Bowling-full")
+def load_full() -> pd.DataFrame:
+    return read_sheet("Bowling-full")
+
+@cached("game-facts")
+def load_facts() -> pd.DataFrame:
+    """One row of precomputed facts per Bowling-full game, see `facts`."""
+    stored = facts.read()
+    return stored if stored is not None else facts.rebuild(load_full())
+
+@cached("Bowling-full")
+def load_bonus_events() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Spare and strike bonus events of the whole Bowling-full history, with
+    each event's Date; parsed once per version of the sheet.
+    """
+    from bonus_viz import transition_events
+    full = load_full()
+    spares, strikes = transition_events(full["Game String"])
+    dates = full["Date"].to_numpy()
+    return (spares.assign(Date=dates[spares["GameIndex"]]),
+            strikes.assign(Date=dates[strikes["GameIndex"]]))
+
+METRICS = ["Spares", "Strikes", "Pins", "Total"]
+_rolling = {"rows": 0, "digest": None, "value": None, "lock": threading.Lock()}
+_pbs = {"rows": 0, "digest": None, "value": None, "lock": threading.Lock()}
+
+def _digest(df: pd.DataFrame) -> int:
+    # Game too: the PB index reports game numbers, so a renumbered row rebuilds it
+    cols = ["Date", "Location", "Game", *METRICS]
+    return int(pd.util.hash_pandas_object(df[cols], index=False).sum())
+
+def _incremental(state: dict, df: pd.DataFrame, build, add):
+    """
+    `build(df)`, kept in `state`: when the sheet only grew since the last
+    call, just `add(value, new rows)` runs; any other change rebuilds.
+    """
+    with state["lock"]:
+        seen, value = state["rows"], state["value"]
+        if value is None or len(df) < seen or _digest(df.iloc[:seen]) != state["digest"]:
+            value, seen = build(df), len(df)
+        if len(df) > seen:
+            add(value, df.iloc[seen:])
+        state.update(rows=len(df), digest=_digest(df), value=value)
+    return value
+
+@cached("Bowling")
+def load_rolling() -> RollingStats:
+    """
+    Rolling per-session sums of the Bowling metrics. When the sheet only
+    grew since the last load, just the new games are appended; any other
+    change rebuilds it.
+    """
+    def add(stats, new):
+        for row in new.itertuples(index=False):
+            stats.append(row.Date, row.Location, {m: getattr(row, m) for m in METRICS})
+    return _incremental(_rolling, load_sessions(), lambda df: RollingStats.from_frame(df, METRICS), add)
+
+PB_METRICS = [*METRICS, "StrikeRun"]
+STREAKS = {"200+": lambda g: g["Total"] >= 200, "Clean": lambda g: g["Opens"] == 0}
+
+def _pb_games(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bowling rows plus, from the game facts, each game's longest run of
+    strikes and its open frames (NaN for games without throw detail).
+    """
+    keys = ["Date", "Location", "Game"]
+    f = load_facts()
+    if f.empty:  # no Bowling-full history: the Bowling records still work
+        return df.assign(StrikeRun=np.nan, Opens=np.nan)
+    strings = f["Game String"].fillna("").astype(str)
+    width = max(1, int(strings.str.len().max()))
+    chars = strings.str.ljust(width).to_numpy().astype(f"U{width}").view("U1").reshape(-1, width)
+    detail = pd.DataFrame({"StrikeRun": longest_run(chars == "X"), "Opens": f["Opens"].to_numpy()},
+                          index=pd.MultiIndex.from_frame(f[keys].astype(str)))
+    detail = detail[~detail.index.duplicated(keep="last")]
+    got = detail.reindex(pd.MultiIndex.from_frame(df[keys].astype(str)))
+    return df.assign(StrikeRun=got["StrikeRun"].to_numpy(), Opens=got["Opens"].to_numpy())
+
+@cached("Bowling")
+def load_pbs() -> PBIndex:
+    """
+    Personal-best index of the Bowling games (top games per metric,
+    streak records), appended to like `load_rolling`.
+    """
+    def build(df):
+        games = _pb_games(df)
+        return PBIndex.from_frame(games, PB_METRICS, {s: f(games) for s, f in STREAKS.items()})
+    def add(index, new):
+        games = _pb_games(new)
+        flags = pd.DataFrame({s: f(games) for s, f in STREAKS.items()}).to_dict("records")
+        for row, flag in zip(games.itertuples(index=False), flags):
+            index.append(row.Date, row.Location, row.Game,
+                         {m: getattr(row, m) for m in PB_METRICS}, flag)
+    return _incremental(_pbs, load_sessions(), build, add)
+
+@cached("Bowling")
+def load_cube() -> Cube:
+    """(Date, Location) aggregates of the Bowling sessions, see `cube`."""
+    return Cube.from_frame(load_sessions())
+
+@cached("Bowling-full")
+def load_bonus_rolling() -> tuple[RollingStats, RollingStats]:
+    """Per-day spare bonus and strike bonus (both balls) rolling stats."""
+    spares, strikes = load_bonus_events()
+    strikes = strikes.assign(StrikeBonus=strikes["bonus1"] + strikes["bonus2"])
+    return (RollingStats.from_frame(spares, ["bonus_throw"], location=None),
+            RollingStats.from_frame(strikes, ["StrikeBonus"], location=None))
 
 def filter_sessions(df: pd.DataFrame, start_date, end_date, location: str) -> pd.DataFrame:
     mask = (df["Date"] >= start_date) & (df["Date"] <= end_date)
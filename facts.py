@@ -0,0 +1,134 @@
+"""
+Materialised per-game facts: one row per Bowling-full game with everything
+the tabs derive from its throws, scored once when the game is pushed or
+synced instead of on every page view.
+
+    python facts.py backfill     # rebuild the table from the whole history
+
+Columns, besides Date / Location / Game / Game String:
+    Total, Pins, Strikes, Spares, Opens, SpareBonus, StrikeBonus
+    R1..R10      rolls per frame as written (R10: the whole 10th frame)
+    F1..F10      frame scores         C1..C10      cumulative scores
+    First1..10   first-ball pins      Bonus1..10   bonus pins per frame
+                                      (Bonus10: the 10th's fill balls)
+"""
+import argparse
+import os
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from cache import invalidate
+from result_ocr.scoring import encode_games, score_encoded
+
+FACTS = Path(__file__).parent / ".cache" / "mirror" / "game_facts.parquet"
+KEY_COLS = ["Date", "Location", "Game"]
+FRAMES = range(1, 11)
+COLUMNS = [*KEY_COLS, "Game String", "Total", "Pins", "Strikes", "Spares", "Opens",
+           "SpareBonus", "StrikeBonus",
+           *(f"{p}{i}" for p in ("R", "F", "C", "First", "Bonus") for i in FRAMES)]
+
+# one writer at a time: pushes from several sessions and the background sync
+_lock = threading.Lock()
+
+def parse_dates(values, dayfirst: bool = False) -> pd.Series:
+    """
+    Sheet dates -> datetime.date (NaT when unreadable), element by element.
+    Year-first strings (the sync's %Y/%m/%d, ISO) are read as such; the
+    rest follow the sheet's rule: Bowling-full is month first
+    (%m/%d/%Y), Bowling day first.
+    """
+    raw = pd.Series(values, dtype=object)
+    text = raw.astype(str).str.strip().str[:10]
+    iso = text.str.match(r"\d{4}[/-]\d{1,2}[/-]\d{1,2}$")
+    out = pd.to_datetime(raw.where(~iso), format="mixed", dayfirst=dayfirst, errors="coerce")
+    out[iso] = pd.to_datetime(text[iso].str.replace("-", "/"), format="%Y/%m/%d", errors="coerce")
+    return out.dt.date
+
+def _game_strings(rows: pd.DataFrame) -> pd.Series:
+    """The Game String column, or the throw columns joined when it is missing."""
+    if "Game String" in rows:
+        return rows["Game String"].fillna("").astype(str)
+    throws = rows.filter(regex=r"^Frame\d+-\d$").fillna("").astype(str)
+    return throws.agg("".join, axis=1)
+
+def compute(rows: pd.DataFrame) -> pd.DataFrame:
+    """Facts for Bowling-full rows (sheet records, typed mirror rows or pushed detail)."""
+    if rows.empty:
+        return pd.DataFrame(columns=COLUMNS)
+    strings = _game_strings(rows).reset_index(drop=True)
+    res = score_encoded(*encode_games(strings))
+    frames, first, bonus = res["Frames"], res["First"], res["Bonus"]
+    strike, spare = res["Strike"], res["Spare"]
+
+    # frame strings: each frame runs up to the next one's first roll
+    ends = np.column_stack([res["Starts"][:, 1:], strings.str.len().to_numpy()])
+    rolls = [[s[a:b] for a, b in zip(st, en)]
+             for s, st, en in zip(strings, res["Starts"].tolist(), ends.tolist())]
+
+    out = pd.DataFrame({
+        "Date":        parse_dates(rows["Date"]).to_numpy(),
+        "Location":    rows["Location"].astype(str).to_numpy(),
+        "Game":        pd.to_numeric(rows["Game"], errors="coerce", downcast="integer").to_numpy(),
+        "Game String": strings,
+        "Total":       res["Total"].astype(np.int16),
+        "Pins":        res["Pins"].astype(np.int16),
+        "Strikes":     res["Strikes"].astype(np.int8),
+        "Spares":      res["Spares"].astype(np.int8),
+        "Opens":       (~(strike | spare)).sum(axis=1).astype(np.int8),
+        "SpareBonus":  np.where(spare, bonus, 0).sum(axis=1).astype(np.int16),
+        "StrikeBonus": np.where(strike, bonus, 0).sum(axis=1).astype(np.int16),
+    })
+    blocks = [pd.DataFrame(rolls, columns=[f"R{i}" for i in FRAMES])]
+    for prefix, values in [("F", frames), ("C", frames.cumsum(axis=1)),
+                           ("First", first), ("Bonus", bonus)]:
+        blocks.append(pd.DataFrame(values.astype(np.int16),
+                                   columns=[f"{prefix}{i}" for i in FRAMES]))
+    return pd.concat([out, *blocks], axis=1)
+
+def read() -> pd.DataFrame | None:
+    """The stored table, or None before the first push/sync/backfill."""
+    return pd.read_parquet(FACTS) if FACTS.exists() else None
+
+def _write(df: pd.DataFrame):
+    FACTS.parent.mkdir(parents=True, exist_ok=True)
+    tmp = FACTS.with_suffix(".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, FACTS)  # readers never see a half-written file
+    invalidate("game-facts")
+
+def rebuild(rows: pd.DataFrame) -> pd.DataFrame:
+    """Replace the whole table with the facts of `rows`; returns them."""
+    facts = compute(rows)
+    with _lock:
+        _write(facts)
+    return facts
+
+def upsert(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the facts of `rows`, replacing stored games with the same
+    (Date, Location, Game); returns the facts of `rows`, in their order.
+    """
+    facts = compute(rows)
+    with _lock:
+        old = read()
+        if old is not None and not old.empty:
+            keys = pd.MultiIndex.from_frame(facts[KEY_COLS].astype(str))
+            stale = pd.MultiIndex.from_frame(old[KEY_COLS].astype(str)).isin(keys)
+            facts_all = pd.concat([old[~stale], facts], ignore_index=True)
+        else:
+            facts_all = facts
+        _write(facts_all)
+    return facts
+
+def backfill() -> pd.DataFrame:
+    """Rebuild the table from the Bowling-full mirror."""
+    from mirror import read_sheet
+    return rebuild(read_sheet("Bowling-full"))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Materialised per-game facts")
+    ap.add_argument("cmd", choices=["backfill"])
+    args = ap.parse_args()
+    facts = backfill()
+    print(f"{len(facts)} games -> {FACTS}")
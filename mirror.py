@@ -0,0 +1,109 @@
+"""
+Local Parquet mirror of the Bowling / Bowling-full worksheets.
+
+Reads are served from disk; a background thread re-downloads a sheet once
+its mirror is older than REFRESH_AFTER seconds. After one of our own writes
+(`cache.invalidate`) the next read re-downloads synchronously.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+import pandas as pd
+from cache import on_invalidate
+from facts import parse_dates
+from sheets import get_session_sheet, get_ground_truth_sheet
+
+MIRROR_DIR = Path(__file__).parent / ".cache" / "mirror"
+REFRESH_AFTER = 60  # seconds
+
+THROW_COLS = [f"Frame{f}-{a}" for f in range(1, 10) for a in (1, 2)] + \
+             ["Frame10-1", "Frame10-2", "Frame10-3"]
+
+_locks = {}
+_refreshing = set()
+_dirty = set()
+
+def _type_sessions(df: pd.DataFrame) -> pd.DataFrame:
+    """Bowling: Date as date32, Location as a category, metrics as small ints."""
+    if df.empty:
+        return df
+    df = df.dropna(subset=["Date"])
+    df["Date"] = parse_dates(df["Date"], dayfirst=True).to_numpy()
+    df = df.dropna(subset=["Date"])
+    df["Location"] = df["Location"].astype("category")
+    for col in ["Game", "Spares", "Strikes", "Pins", "Total"]:
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce", downcast="integer")
+    return df.reset_index(drop=True)
+
+def _throw_pins(raw: pd.DataFrame) -> pd.DataFrame:
+    """Per-throw symbols -> pins as int8 ("/" resolved, blanks as <NA>)."""
+    raw = raw.astype(str).apply(lambda c: c.str.strip())
+    pins = raw.replace({"X": "10", "-": "0", "F": "0"}).apply(pd.to_numeric, errors="coerce")
+    pins = pins.mask(raw.eq("/"), 10 - pins.shift(axis=1))
+    return pins.astype("Int8")
+
+def _type_full(df: pd.DataFrame) -> pd.DataFrame:
+    """Bowling-full: typed keys, int8 throws, Game String kept verbatim."""
+    if df.empty:
+        return df
+    df["Date"] = parse_dates(df["Date"]).to_numpy()
+    df["Location"] = df["Location"].astype("category")
+    df["Game"] = pd.to_numeric(df["Game"], errors="coerce", downcast="integer")
+    df["Game String"] = df["Game String"].astype(str)
+    throws = [c for c in THROW_COLS if c in df]
+    if throws:
+        df[throws] = _throw_pins(df[throws])
+    return df
+
+SHEETS = {
+    "Bowling":      (get_session_sheet,      _type_sessions),
+    "Bowling-full": (get_ground_truth_sheet, _type_full),
+}
+
+for _name in SHEETS:
+    on_invalidate(_name, _dirty.add)
+
+def _path(name: str) -> Path:
+    return MIRROR_DIR / f"{name}.parquet"
+
+def store(name: str, records: list[dict]) -> pd.DataFrame:
+    """Type `records` (as returned by get_all_records) and write the mirror."""
+    df = SHEETS[name][1](pd.DataFrame(records))
+    MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = _path(name).with_suffix(".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, _path(name))  # readers never see a half-written file
+    return df
+
+def refresh(name: str) -> pd.DataFrame:
+    """Download the worksheet and rewrite its mirror."""
+    with _locks.setdefault(name, threading.Lock()):
+        _dirty.discard(name)
+        return store(name, SHEETS[name][0]().get_all_records())
+
+def _refresh_in_background(name: str):
+    if name in _refreshing:
+        return
+    _refreshing.add(name)
+    def run():
+        try:
+            refresh(name)
+        finally:
+            _refreshing.discard(name)
+    threading.Thread(target=run, daemon=True).start()
+
+def read_sheet(name: str) -> pd.DataFrame:
+    """
+    Typed DataFrame for `name`, read from the memory-mapped mirror.
+    The first read (and the first after a write) downloads synchronously;
+    stale mirrors are refreshed in the background while the current copy
+    is returned.
+    """
+    path = _path(name)
+    if name in _dirty or not path.exists():
+        return refresh(name)
+    if time.time() - path.stat().st_mtime > REFRESH_AFTER:
+        _refresh_in_background(name)
+    return pd.read_parquet(path, memory_map=True)
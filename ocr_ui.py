@@ -1,70 +1,45 @@
+import time
+from contextlib import nullcontext
 import streamlit as st
 import pandas as pd
-import cv2, numpy as np
-from PIL import Image
 from sheets import push_session_data, push_ground_truth
-from result_ocr.ocr import run_pipeline
-from result_ocr.preprocess import to_gray, remove_red_circles
-from result_ocr.segment   import crop_row, split_frames
+from write_queue import pending
+from result_ocr.ocr import Pipeline, decode, recognizers, tesseract_available, warm_up
+from result_ocr.batch import run_many
+from result_ocr.ocr_cache import cached_stream
+from result_ocr.scoring import Game
+from result_ocr.preprocess import to_gray
+from result_ocr import profiling
 
 def compute_bowling_stats(frames):
-    # Build flat list of roll scores + frame start indices
-    rolls = []
-    frame_starts = []
-    bonus_pins = 0
-    for fr in frames:
-        frame_starts.append(len(rolls))
-        if fr == "X":
-            rolls.append(10)
-        else:
-            # first roll
-            a = fr[0]
-            rolls.append(int(a) if a.isdigit() else 0)
-            # second roll
-            b = fr[1]
-            if b == "/":
-                rolls.append(10 - rolls[-1])
-            else:
-                rolls.append(int(b) if b.isdigit() else 0)
-        # tenth frame can have a third roll
-        if len(fr) == 3:
-            c = fr[2]
-            if c == "X":
-                bonus_pins = 10
-            elif c == "/":
-                bonus_pins = 10 - rolls[-1]
-            else:
-                bonus_pins = (int(c) if c.isdigit() else 0)
-            rolls.append(bonus_pins)
-
-    total_score, strikes, spares = 0, 0, 0
-    for i, fr in enumerate(frames):
-        idx = frame_starts[i]
-        # Strike
-        if fr == "X":
-            strikes += 1
-            total_score += 10
-            # bonus next two rolls
-            if idx+1 < len(rolls): total_score += rolls[idx+1]
-            if idx+2 < len(rolls): total_score += rolls[idx+2]
-        # Spare (but not strike)
-        elif "/" in fr:
-            spares += 1
-            total_score += 10
-            # bonus next one roll
-            if idx+2 < len(rolls): total_score += rolls[idx+2]
-        else:
-            # Open frame or 10th frame leftover
-            # count how many rolls this frame contributed
-            count = 1 if fr=="X" else (2 if len(fr)==2 else 3)
-            total_score += sum(rolls[idx: idx+count])
-
-    return {
-        "Total":    total_score,
-        "Strikes":  strikes,
-        "Spares":   spares,
-        "Pins":     sum(rolls) - bonus_pins
-    }
+    """Totals for a list of per-frame strings as read off the score sheet."""
+    return Game.from_frames(frames).stats()
+
+def show_profile(pipe, records):
+    """Stage timings of `pipe`, plus memory and engines when `records` were collected."""
+    if not records:
+        st.table(pd.Series(pipe.timings, name="seconds").round(4))
+        return
+    summary = profiling.summary(records)
+    st.table(pd.DataFrame(summary["stages"]).T.round(4))
+    frames = [r for r in records if r["kind"] == "event" and r["name"] == "frame"]
+    if frames:
+        st.dataframe(pd.DataFrame(frames)[["frame", "engine", "text"]], hide_index=True)
+    st.download_button("Download profile JSON", profiling.to_json(records),
+                       file_name="ocr_profile.json", mime="application/json")
+
+def _corrections() -> dict:
+    """
+    Frame index -> the user's correction, kept across the reruns an edit
+    triggers while OCR is still streaming in (each render of the table is a
+    new editor, so its own edits would not survive).
+    """
+    corrections = st.session_state.setdefault("ocr_corrections", {})
+    for key in [k for k in st.session_state if str(k).startswith("ocr_edit_")]:
+        for row, change in st.session_state[key].get("edited_rows", {}).items():
+            if "Corrected" in change:
+                corrections[int(row)] = change["Corrected"] or ""
+    return corrections
 
 def get_data_editor():
     """Picks the available Streamlit editor API."""
@@ -74,8 +49,15 @@ def get_data_editor():
         return st.experimental_data_editor
     return None
 
+def _warm_up_fallback():
+    # without tesseract every frame goes to easyocr: start loading it now
+    if not tesseract_available() and not st.session_state.get("ocr_warm"):
+        warm_up()
+        st.session_state["ocr_warm"] = True
+
 def session_input_tab():
     st.subheader("➕ Input with OCR Review")
+    _warm_up_fallback()
 
     # 1) Metadata
     cols_metadata = st.columns(3)
@@ -92,40 +74,60 @@ def session_input_tab():
         st.info("Please upload a row‐crop.")
         return
 
-    pil = Image.open(uploaded)
-    bgr = cv2.cvtColor(np.array(pil), cv2.COLOR_RGB2BGR)
-    row = crop_row(bgr)
-    clean = remove_red_circles(row)
-    frames = split_frames(clean)
-    cols = st.columns(10)
-    for i,f in enumerate(frames):
-        with cols[i]:
-            st.image(to_gray(f), clamp=True)
-            st.caption(f"F{i+1}")
-
-    # OCR
-    preds = run_pipeline(bgr)
-    df = pd.DataFrame({"Frame":range(1,11),"Predicted":preds,"Corrected":preds[:]})
-    if hasattr(st, "data_editor"):
-        edited = st.data_editor(
-            df,
-            num_rows="fixed",
-            use_container_width=True,
-            hide_index=False
-        )
-    else:
-        edited = st.experimental_data_editor(
-            df,
-            num_rows="fixed",
-            use_container_width=True
-        )
-    
+    # one staged pipeline per upload: preview and OCR share every stage
+    data = uploaded.getvalue()
+    engine = st.selectbox("Recognizer", recognizers(),
+                          help="cells: a small per-box classifier trained on data/images")
+    profile = st.checkbox("Profile OCR (memory and engine per frame)")
+    if st.session_state.get("ocr_upload") != (data, profile):
+        st.session_state["ocr_upload"] = (data, profile)
+        st.session_state["ocr_pipeline"] = Pipeline(decode(data))
+        st.session_state["ocr_profile"] = []
+        st.session_state["ocr_corrections"] = {}
+    pipe = st.session_state["ocr_pipeline"]
+    corrections = _corrections()
+    editor = get_data_editor()
+    df = pd.DataFrame({"Frame": range(1, 11), "Predicted": [""] * 10, "Corrected": [""] * 10,
+                       "Confidence": [None] * 10, "Engine": ["…"] * 10})
+
+    def show(done):
+        # the table fills in as frames arrive; edits made meanwhile are kept
+        df["Corrected"] = [corrections.get(i, p) for i, p in enumerate(df["Predicted"])]
+        with table.container():
+            return editor(df, num_rows="fixed", use_container_width=True, key=f"ocr_edit_{done}")
+
+    with profiling.collect(memory=True) if profile else nullcontext([]) as records:
+        cols = st.columns(10)
+        for i,f in enumerate(pipe.frames):
+            with cols[i]:
+                st.image(to_gray(f), clamp=True)
+                st.caption(f"F{i+1}")
+        table = st.empty()
+
+        # OCR streams frame by frame (reruns and repeat uploads are served
+        # from the cache, except when profiling, which wants the recognizers
+        # to actually run)
+        frames = (pipe.stream(engine=engine) if profile
+                  else cached_stream(data, pipe, engine=engine))
+        shown, done = time.perf_counter(), 0
+        for i, text, confidence, answered in frames:
+            df.loc[i, ["Predicted", "Confidence", "Engine"]] = [text, confidence, answered]
+            done += 1
+            if done < 10 and time.perf_counter() - shown > 0.1:
+                show(done)
+                shown = time.perf_counter()
+    st.session_state["ocr_profile"] += records
+    edited = show(10)
+    with st.expander("⏱ Stage timings"):
+        show_profile(pipe, st.session_state["ocr_profile"])
+
     # 4) Compute Totals in one row of metrics
     if st.button("Compute Totals"):
-        final = edited["Corrected"].tolist()
+        # cleared cells come back as None/NaN: an empty frame, not "None"
+        final = [c if isinstance(c, str) else "" for c in edited["Corrected"]]
         stats = compute_bowling_stats(final)
         stats["Date"], stats["Location"], stats["Game"] = (
-            date.strftime("%m/%d/%Y"), loc, int(game_n)
+            date.strftime("%Y/%m/%d"), loc, int(game_n)
         )
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("🏆 Total Score", f"{stats['Total']}")
@@ -138,49 +140,104 @@ def session_input_tab():
     # 5) Submit both session and detailed frames
     if st.session_state.get("ocr_stats") and st.button("Submit Session"):
         s = st.session_state["ocr_stats"]
-        # aggregate to Bowling
-        push_session_data(pd.DataFrame([{
-            "Date":     s["Date"],
-            "Location": s["Location"],
-            "Game":     s["Game"],
-            "Spares":   s["Spares"],
-            "Strikes":  s["Strikes"],
-            "Pins":     s["Pins"],
-            "Total":    s["Total"]
-        }]))
-        # detailed to Bowling-full
-        frames = st.session_state["ocr_frames"]
-        rolls = []
-        # frames 1–9: exactly 2 rolls each
-        for fr in frames[:9]:
-            if fr == "X":
-                # strike → 10 pins on first roll, blank second roll
-                rolls += ["X", ""]
-            elif "/" in fr:
-                rolls += [fr[0], "/"]
-            else:
-                a = fr[0] if len(fr) > 0 else ""
-                b = fr[1] if len(fr) > 1 else ""
-                rolls += [a, b]
-        # frame 10: up to 3 rolls
-        fr10 = frames[9]
-        for ch in fr10:
-            rolls.append(ch)
-        # pad to 21 throws if only 2 in 10th frame
-        while len(rolls) < 21:
-            rolls.append("")
-
-        # build detail dict
-        detail = {
-            "Date":     s["Date"],
-            "Location": s["Location"],
-            "Game":     s["Game"],
-        }
-        # assign T1…T21
-        for idx, r in enumerate(rolls, start=1):
-            frame = min((idx + 1) // 2, 10)
-            attempt = idx - frame * 2 + 2
-            detail[f"Frame{frame}-{attempt}"] = r
-
-        push_ground_truth(pd.DataFrame([detail]))        
-        st.success("✅ Session saved!")
\ No newline at end of file
+        push_game(st.session_state["ocr_frames"], s["Date"], s["Location"], s["Game"])
+        _saved_message()
+
+def _saved_message():
+    if pending():
+        st.success("✅ Session queued – it will be uploaded with the next batch.")
+    else:
+        st.success("✅ Session saved!")
+
+def frames_to_detail(frames, date_str, loc, game) -> dict:
+    """One Bowling-full row (Frame1-1 … Frame10-3) from per-frame strings."""
+    rolls = []
+    # frames 1–9: exactly 2 rolls each
+    for fr in frames[:9]:
+        if fr == "X":
+            # strike → 10 pins on first roll, blank second roll
+            rolls += ["X", ""]
+        elif "/" in fr:
+            rolls += [fr[0], "/"]
+        else:
+            a = fr[0] if len(fr) > 0 else ""
+            b = fr[1] if len(fr) > 1 else ""
+            rolls += [a, b]
+    # frame 10: up to 3 rolls
+    fr10 = frames[9]
+    for ch in fr10:
+        rolls.append(ch)
+    # pad to 21 throws if only 2 in 10th frame
+    while len(rolls) < 21:
+        rolls.append("")
+
+    # build detail dict
+    detail = {
+        "Date":     date_str,
+        "Location": loc,
+        "Game":     game,
+    }
+    # assign T1…T21
+    for idx, r in enumerate(rolls, start=1):
+        frame = min((idx + 1) // 2, 10)
+        attempt = idx - frame * 2 + 2
+        detail[f"Frame{frame}-{attempt}"] = r
+    return detail
+
+def push_game(frames, date_str, loc, game):
+    """Queue one game for both the Bowling (aggregate) and Bowling-full sheets."""
+    s = compute_bowling_stats(frames)
+    # aggregate to Bowling
+    push_session_data(pd.DataFrame([{
+        "Date":     date_str,
+        "Location": loc,
+        "Game":     game,
+        "Spares":   s["Spares"],
+        "Strikes":  s["Strikes"],
+        "Pins":     s["Pins"],
+        "Total":    s["Total"]
+    }]))
+    # detailed to Bowling-full
+    push_ground_truth(pd.DataFrame([frames_to_detail(frames, date_str, loc, game)]))
+
+def bulk_input_tab():
+    st.subheader("📚 Whole-session OCR")
+    _warm_up_fallback()
+
+    cols_metadata = st.columns(3)
+    with cols_metadata[0]:
+        date    = st.date_input("Date", key="bulk_date")
+    with cols_metadata[1]:
+        loc     = st.text_input("Location", key="bulk_loc")
+    with cols_metadata[2]:
+        first_n = st.number_input("First game number", min_value=1, step=1, key="bulk_first")
+
+    uploads = st.file_uploader("Upload every score-sheet image of the session",
+                               type=["png","jpg","jpeg"], accept_multiple_files=True)
+    if not uploads:
+        st.info("Upload one image per game; games are numbered in file-name order.")
+        return
+    uploads = sorted(uploads, key=lambda u: u.name)
+
+    # OCR all images on a process pool; keep results across reruns
+    key = tuple((u.name, u.size) for u in uploads)
+    if st.session_state.get("bulk_key") != key:
+        with st.spinner(f"Reading {len(uploads)} images…"):
+            st.session_state["bulk_preds"] = run_many([u.getvalue() for u in uploads])
+        st.session_state["bulk_key"] = key
+
+    editor = get_data_editor()
+    games = []
+    for n, (u, preds) in enumerate(zip(uploads, st.session_state["bulk_preds"])):
+        game_no = int(first_n) + n
+        st.markdown(f"**Game {game_no}** – {u.name}")
+        df = pd.DataFrame([preds], columns=[f"F{i}" for i in range(1, 11)])
+        edited = editor(df, num_rows="fixed", use_container_width=True, key=f"bulk_{u.name}")
+        frames = [c if isinstance(c, str) else "" for c in edited.iloc[0]]
+        st.caption(f"Total {compute_bowling_stats(frames)['Total']}")
+        games.append((frames, game_no))
+
+    if st.button("Submit all games"):
+        for frames, game_no in games:
+            push_game(frames, date.strftime("%Y/%m/%d"), loc, game_no)
+        _saved_message()
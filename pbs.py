@@ -0,0 +1,177 @@
+"""
+Personal-best index: the top K games per metric, per location and over
+all locations (all-time and per calendar year), plus streak records over
+each location's games in date order.
+
+    pbs = PBIndex.from_frame(games, ["Total", "Pins"], streaks={"200+": games["Total"] >= 200})
+    pbs.top("Total", 10, "Kai Tak", start=date(2025, 1, 1))   # top 10 at Kai Tak this year
+    pbs.streak("200+", "All")                                  # longest run of 200+ games
+
+`append` keeps the heaps up to date in O(log K). A date-range query
+merges the heaps of the years it fully covers and only scans the games
+of the (at most two) years it cuts through.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date
+import numpy as np
+import pandas as pd
+
+K = 10
+ALL = "All"
+
+def longest_run(mask: np.ndarray) -> np.ndarray:
+    """Longest run of True along each row of a 2-D boolean array."""
+    n, w = mask.shape
+    pos = np.arange(1, w + 1)
+    # index of the last False up to each column; run length = column - that
+    last_false = np.maximum.accumulate(np.where(mask, 0, pos), axis=1)
+    return (pos - last_false).max(axis=1, initial=0) if w else np.zeros(n, int)
+
+class _Loc:
+    """One location's games in date order, with arrays and streak runs built lazily."""
+    __slots__ = ("keys", "rows", "flags", "_seqs", "_runs")
+
+    def __init__(self, streaks):
+        self.keys, self.rows = [], []   # (date, seq) sorted; row ids
+        self.flags = {s: [] for s in streaks}
+        self._seqs, self._runs = None, {}
+
+    def add(self, key, row, flags: dict):
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.rows.insert(i, row)
+        for s, v in flags.items():
+            self.flags[s].insert(i, bool(v))
+        self._seqs = None
+        self._runs.clear()
+
+    def span(self, start=None, end=None) -> tuple[int, int]:
+        lo = 0 if start is None else bisect_left(self.keys, (start, -1))
+        hi = len(self.keys) if end is None else bisect_right(self.keys, (end, float("inf")))
+        return lo, max(lo, hi)
+
+    def seqs(self) -> np.ndarray:
+        if self._seqs is None:
+            self._seqs = np.array(self.rows, dtype=np.int64)
+        return self._seqs
+
+    def runs(self, streak) -> tuple[np.ndarray, np.ndarray]:
+        """(first, last + 1) positions of every run of flagged games."""
+        if streak not in self._runs:
+            f = np.r_[False, np.array(self.flags[streak], bool), False].astype(np.int8)
+            edges = np.diff(f)
+            self._runs[streak] = (np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+        return self._runs[streak]
+
+class PBIndex:
+    def __init__(self, metrics: list[str], streaks: list[str] = (), k: int = K):
+        self.metrics, self.streaks, self.k = list(metrics), list(streaks), k
+        self._games = []     # seq -> (Date, Location, Game)
+        self._values = np.full((64, len(self.metrics)), np.nan)  # seq -> metric values
+        self._locs = {ALL: _Loc(self.streaks)}
+        self._heaps = {}     # (metric, location, year or None) -> min-heap of (value, -seq)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, metrics: list[str], streaks: dict | None = None,
+                   k: int = K) -> "PBIndex":
+        """
+        Index one row per game (Date, Location, Game and the metrics);
+        `streaks` maps a streak name to a boolean Series over the rows.
+        """
+        streaks = streaks or {}
+        index = cls(metrics, list(streaks), k)
+        df = df.dropna(subset=["Date"])
+        order = np.lexsort((pd.to_numeric(df["Game"], errors="coerce").fillna(0).to_numpy(),
+                            pd.to_datetime(df["Date"]).to_numpy()))
+        cols = {m: df[m].to_numpy(float)[order] for m in metrics}
+        flags = {s: np.asarray(v.loc[df.index], bool)[order] for s, v in streaks.items()}
+        rows = df[["Date", "Location", "Game"]].to_numpy()[order]
+        for i, (d, loc, game) in enumerate(rows):
+            index.append(d, loc, game, {m: cols[m][i] for m in metrics},
+                         {s: flags[s][i] for s in flags})
+        return index
+
+    def append(self, day, location, game, values: dict, flags: dict | None = None):
+        """Index one game. Games normally arrive in date order; older ones are inserted."""
+        seq = len(self._games)
+        location = str(location)
+        self._games.append((day, location, game))
+        flags = {s: (flags or {}).get(s, False) for s in self.streaks}
+        for loc in (ALL, location):
+            self._locs.setdefault(loc, _Loc(self.streaks)).add((day, seq), seq, flags)
+        if seq == len(self._values):
+            self._values = np.vstack([self._values, np.full_like(self._values, np.nan)])
+        for j, m in enumerate(self.metrics):
+            v = self._values[seq, j] = float(values.get(m, np.nan))
+            if np.isnan(v):
+                continue
+            for loc in (ALL, location):
+                for year in (None, day.year):
+                    heap = self._heaps.setdefault((m, loc, year), [])
+                    item = (v, -seq)
+                    if len(heap) < self.k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+
+    @property
+    def locations(self) -> list[str]:
+        return [loc for loc in self._locs if loc != ALL]
+
+    def _scan(self, metric, loc: _Loc, start, end, k) -> list:
+        """The top k (value, -seq) of loc's games dated in [start, end], by scanning them."""
+        lo, hi = loc.span(start, end)
+        seqs = loc.seqs()[lo:hi]
+        vals = self._values[seqs, self.metrics.index(metric)]
+        keep = ~np.isnan(vals)
+        seqs, vals = seqs[keep], vals[keep]
+        if len(vals) > k:
+            # everything tied with the k-th best, so ties still go to the earliest game
+            tied = vals >= -np.partition(-vals, k - 1)[k - 1]
+            seqs, vals = seqs[tied], vals[tied]
+        return heapq.nlargest(k, zip(vals.tolist(), (-seqs).tolist()))
+
+    def top(self, metric: str, k: int = K, location=ALL, start=None, end=None) -> pd.DataFrame:
+        """
+        The k best games for `metric` at `location` dated in [start, end]
+        (inclusive; None for open ends), best first, ties to the earliest.
+        """
+        loc = self._locs.get(ALL if location in (None, ALL) else str(location))
+        if loc is None or not loc.keys:
+            found = []
+        elif k > self.k:
+            found = self._scan(metric, loc, start, end, k)
+        elif start is None and end is None:
+            found = list(self._heaps.get((metric, location or ALL, None), []))
+        else:
+            first, last = loc.keys[0][0].year, loc.keys[-1][0].year
+            y0 = max(first, start.year if start else first)
+            y1 = min(last, end.year if end else last)
+            found = []
+            for year in range(y0, y1 + 1):
+                whole = (start is None or start <= date(year, 1, 1)) and \
+                        (end is None or end >= date(year, 12, 31))
+                if whole:
+                    found += self._heaps.get((metric, location or ALL, year), [])
+                else:
+                    found += self._scan(metric, loc, max(start or date.min, date(year, 1, 1)),
+                                        min(end or date.max, date(year, 12, 31)), k)
+        best = heapq.nlargest(k, found)
+        return pd.DataFrame([(*self._games[-s], v) for v, s in best],
+                            columns=["Date", "Location", "Game", metric])
+
+    def streak(self, name: str, location=ALL, start=None, end=None) -> tuple[int, object, object]:
+        """(length, first date, last date) of the longest run of `name` games in [start, end]."""
+        loc = self._locs.get(ALL if location in (None, ALL) else str(location))
+        if loc is None or not loc.keys:
+            return 0, None, None
+        lo, hi = loc.span(start, end)
+        first, stop = loc.runs(name)
+        # runs clipped to the date range
+        a, b = np.maximum(first, lo), np.minimum(stop, hi)
+        length = b - a
+        if not len(length) or length.max() <= 0:
+            return 0, None, None
+        i = int(np.argmax(length))
+        return int(length[i]), loc.keys[a[i]][0], loc.keys[b[i] - 1][0]
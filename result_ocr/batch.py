@@ -0,0 +1,119 @@
+"""
+Bulk OCR: run `run_pipeline` over a whole session of score-sheet images
+on a process pool.
+
+    python -m result_ocr.batch data/images --workers 4
+    python -m result_ocr.batch data/images --compare   # per-frame vs strip OCR
+    python -m result_ocr.batch data/images --engines tesseract tesserocr easyocr
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+import numpy as np
+from .ocr import run_pipeline, frame_masks, decode, _stitch
+from .engines import ENGINES
+from .labels import load_labels, label_for
+from . import ocr_cache
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+
+def image_paths(directory) -> list[Path]:
+    return sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in IMAGE_EXTS)
+
+def _ocr_one(data: bytes, **cfg) -> list[str]:
+    return run_pipeline(decode(data), **cfg)
+
+def run_many(sources, workers: int | None = None, cache: bool = True,
+             **cfg) -> list[list[str]]:
+    """
+    Per-frame predictions for every image in `sources` (paths or bytes),
+    in input order. Images already in the OCR cache are not re-run;
+    `workers=1` runs the rest serially in this process.
+    """
+    data = [s if isinstance(s, (bytes, bytearray)) else Path(s).read_bytes()
+            for s in sources]
+    keys = [ocr_cache.key_for(d, **cfg) for d in data]
+    out = [ocr_cache.get(k) if cache else None for k in keys]
+    todo = [i for i, o in enumerate(out) if o is None]
+    workers = min(workers or os.cpu_count() or 1, len(todo) or 1)
+    run = partial(_ocr_one, **cfg)
+    if workers == 1:
+        done = [run(data[i]) for i in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(run, [data[i] for i in todo]))
+    for i, preds in zip(todo, done):
+        out[i] = preds
+        if cache:
+            ocr_cache.put(keys[i], preds)
+    return out
+
+def compare_ocr_modes(paths):
+    """Per-image latency and per-frame accuracy: ten OCR calls vs one strip call."""
+    labels = load_labels()
+    imgs = [(decode(p), label_for(p, labels)) for p in paths]
+    for batched in (False, True):
+        secs, hits, total = [], 0, 0
+        for img, truth in imgs:
+            t = time.perf_counter()
+            preds = run_pipeline(img, batched=batched)
+            secs.append(time.perf_counter() - t)
+            if truth:
+                hits += sum(p == g for p, g in zip(preds, truth))
+                total += len(truth)
+        print(f"{'strip' if batched else 'per-frame':>9}: "
+              f"median {np.median(secs) * 1000:7.1f} ms/image, "
+              f"frame accuracy {hits / max(total, 1):.1%} ({hits}/{total})")
+
+def engine_throughput(paths, engines):
+    """Recognizer-only frames/second per engine, one call per frame and per strip."""
+    masks = [frame_masks(decode(p)) for p in paths]
+    n = sum(len(m) for m in masks)
+    for name in engines:
+        text, boxes = ENGINES[name]
+        try:
+            t = time.perf_counter()
+            for ms in masks:
+                for m in ms:
+                    text(m)
+            per_frame = n / (time.perf_counter() - t)
+            strip = float("nan")
+            if boxes:
+                t = time.perf_counter()
+                for ms in masks:
+                    boxes(_stitch(ms)[0])
+                strip = n / (time.perf_counter() - t)
+        except Exception as e:  # engine not installed here
+            print(f"{name:>10}: unavailable ({type(e).__name__}: {e})")
+            continue
+        print(f"{name:>10}: {per_frame:7.1f} frames/s per frame, {strip:7.1f} frames/s as strip")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Time bulk OCR, serial vs process pool")
+    ap.add_argument("directory", nargs="?", default="data/images")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--compare", action="store_true",
+                    help="compare per-frame and single-strip OCR instead")
+    ap.add_argument("--engines", nargs="+", choices=sorted(ENGINES),
+                    help="report recognizer throughput for these engines instead")
+    args = ap.parse_args()
+
+    paths = image_paths(args.directory)
+    if args.compare:
+        compare_ocr_modes(paths)
+        raise SystemExit
+    if args.engines:
+        engine_throughput(paths, args.engines)
+        raise SystemExit
+    t = time.perf_counter()
+    serial = run_many(paths, workers=1, cache=False)
+    t_serial = time.perf_counter() - t
+    t = time.perf_counter()
+    parallel = run_many(paths, workers=args.workers, cache=False)
+    t_par = time.perf_counter() - t
+    print(f"{len(paths)} images: serial {t_serial:.2f}s, "
+          f"pool {t_par:.2f}s ({t_serial / t_par:.1f}x)"
+          + ("" if serial == parallel else "  [results differ!]"))
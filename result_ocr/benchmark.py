@@ -0,0 +1,170 @@
+"""
+Accuracy and latency of the OCR pipeline over the labelled images.
+
+    python -m result_ocr.benchmark --write-baseline       # record a local baseline
+    python -m result_ocr.benchmark                        # compare with it
+    python -m result_ocr.benchmark data/images --workers 4 --engine tesserocr
+    python -m result_ocr.benchmark --angles               # skew detection error
+    python -m result_ocr.benchmark --per-frame --fallback empty   # old easyocr-on-empty rule
+
+Every labelled image goes through the pipeline uncached. The command
+reports frame and game accuracy, the score error once the predictions are
+scored, the share of frames re-read by the OCR fallback and p50/p90/p99
+latency per pipeline stage. Results are written as
+JSON, so a change to preprocess/deskew/segment can be diffed against a
+baseline recorded on the same machine with --write-baseline (none is
+committed), down to the images whose predictions changed.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+import numpy as np
+from .ocr import Pipeline, decode, DESKEW, SEGMENT, FALLBACK, RECOGNIZERS
+from .deskew import rotate
+from .scoring import Game
+from .labels import load_labels, label_for
+from .batch import image_paths
+from . import profiling
+
+BASELINE = Path(__file__).resolve().parent.parent / "data" / "ocr_baseline.json"
+PERCENTILES = (50, 90, 99)
+
+def _run_one(path, deskew=DESKEW, segment=SEGMENT, **cfg) -> tuple[list[str], dict, int]:
+    """Predictions, per-stage seconds (plus "total") and frames re-read for one image."""
+    with profiling.collect() as records:
+        t = time.perf_counter()
+        pipe = Pipeline(decode(path), deskew, segment)
+        preds = pipe.predictions(**cfg)
+        secs = time.perf_counter() - t
+    reread = profiling.summary(records)["counts"].get("fallback", 0)
+    return preds, dict(pipe.timings, total=secs), reread
+
+def run(paths, workers: int | None = None, **cfg) -> dict:
+    """Benchmark report for the labelled images among `paths`."""
+    labels = load_labels()
+    cases = [(p, label_for(p, labels)) for p in paths]
+    cases = [(p, truth) for p, truth in cases if truth]
+    workers = min(workers or os.cpu_count() or 1, len(cases) or 1)
+    job = partial(_run_one, **cfg)
+    if workers == 1:
+        results = [job(p) for p, _ in cases]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(job, [p for p, _ in cases]))
+
+    frame_hits = game_hits = score_hits = rereads = 0
+    score_err, stage_secs, images = [], {}, {}
+    for (path, truth), (preds, timings, reread) in zip(cases, results):
+        rereads += reread
+        hits = sum(p == g for p, g in zip(preds, truth))
+        frame_hits += hits
+        game_hits += hits == len(truth)
+        pred_total = Game.from_frames(preds).total
+        true_total = Game.from_frames(truth).total
+        score_err.append(abs(pred_total - true_total))
+        score_hits += pred_total == true_total
+        for stage, secs in timings.items():
+            stage_secs.setdefault(stage, []).append(secs)
+        images[Path(path).name] = {"predicted": preds, "truth": truth,
+                                   "total": pred_total, "true_total": true_total}
+    n = max(len(cases), 1)
+    return {
+        "config": {"workers": workers, **cfg},
+        "images": len(cases),
+        "frame_accuracy": frame_hits / (10 * n),
+        "game_accuracy": game_hits / n,
+        "score_exact": score_hits / n,
+        "score_mae": float(np.mean(score_err)) if score_err else 0.0,
+        "fallback_rate": rereads / (10 * n),
+        "latency_ms": {stage: {f"p{q}": float(np.percentile(s, q)) * 1000 for q in PERCENTILES}
+                       for stage, s in stage_secs.items()},
+        "per_image": images,
+    }
+
+def angle_accuracy(paths, modes=("hough", "fast"), tilts=(-3, -1.5, -0.5, 1, 2.5)):
+    """
+    Skew detection error per deskew mode: each image is rotated by known
+    tilts (then its borders trimmed, like a real photo) and the detected
+    change in angle is compared with the tilt applied.
+    """
+    def trim(img, m=0.08):
+        h, w = img.shape[:2]
+        return img[int(h*m):h - int(h*m), int(w*m):w - int(w*m)]
+    imgs = [decode(p) for p in paths]
+    for mode in modes:
+        errs, secs = [], []
+        for img in imgs:
+            level = Pipeline(trim(img), mode).angle
+            for tilt in tilts:
+                pipe = Pipeline(trim(rotate(img, tilt)), mode)
+                errs.append(abs(pipe.angle - level - tilt))
+                secs.append(pipe.timings["angle"])
+        print(f"{mode:>6}: mean error {np.mean(errs):.2f} deg, p90 {np.percentile(errs, 90):.2f}, "
+              f"max {np.max(errs):.2f}; median {np.median(secs) * 1000:.1f} ms")
+
+def print_report(report: dict, baseline: dict | None = None):
+    """Summary table, with the change against `baseline` when given."""
+    def line(label, now, before, fmt):
+        delta = "" if before is None else f"  ({now - before:+{fmt}} vs baseline)"
+        print(f"{label:<16}{now:{fmt}}{delta}")
+    b = baseline or {}
+    print(f"{report['images']} labelled images, config {report['config']}")
+    for key, fmt in [("frame_accuracy", ".1%"), ("game_accuracy", ".1%"),
+                     ("score_exact", ".1%"), ("score_mae", ".2f"), ("fallback_rate", ".1%")]:
+        line(key, report[key], b.get(key), fmt)
+    print(f"\n{'stage (ms)':<22}" + "".join(f"{f'p{q}':>10}" for q in PERCENTILES))
+    for stage, pct in report["latency_ms"].items():
+        old = b.get("latency_ms", {}).get(stage, {})
+        print(f"{stage:<22}" + "".join(
+            f"{pct[k]:10.1f}" + (f" ({pct[k] - old[k]:+.1f})" if k in old else "")
+            for k in pct))
+    if baseline:
+        old = baseline.get("per_image", {})
+        changed = [(name, old[name]["predicted"], r["predicted"], r["truth"])
+                   for name, r in report["per_image"].items()
+                   if name in old and old[name]["predicted"] != r["predicted"]]
+        print(f"\n{len(changed)} image(s) with changed predictions")
+        for name, before, now, truth in changed:
+            fixed = sum(n == t != b for b, n, t in zip(before, now, truth))
+            broke = sum(b == t != n for b, n, t in zip(before, now, truth))
+            print(f"  {name}: {fixed} frame(s) fixed, {broke} broken")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="OCR accuracy/latency over labelled images")
+    ap.add_argument("directory", nargs="?", default="data/images")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--engine", default="tesseract", choices=RECOGNIZERS)
+    ap.add_argument("--per-frame", action="store_true", help="one OCR call per frame")
+    ap.add_argument("--fallback", default=FALLBACK, choices=["ambiguous", "empty"],
+                    help="frames the OCR engines re-read: ambiguous ones or only empty ones")
+    ap.add_argument("--deskew", default=DESKEW, choices=["fast", "hough"])
+    ap.add_argument("--segment", default=SEGMENT, choices=["grid", "fixed"])
+    ap.add_argument("--angles", action="store_true",
+                    help="measure skew detection error per deskew mode instead")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--write-baseline", action="store_true",
+                    help="save this run as the baseline instead of diffing against it")
+    ap.add_argument("-o", "--output", type=Path, help="also write this run's JSON here")
+    args = ap.parse_args()
+
+    if args.angles:
+        angle_accuracy(image_paths(args.directory))
+        raise SystemExit
+    report = run(image_paths(args.directory), args.workers,
+                 batched=not args.per_frame, engine=args.engine, fallback=args.fallback,
+                 deskew=args.deskew, segment=args.segment)
+    baseline = None
+    if not args.write_baseline:
+        if args.baseline.exists():
+            baseline = json.loads(args.baseline.read_text())
+        else:
+            print(f"no baseline at {args.baseline}; record one with --write-baseline")
+    print_report(report, baseline)
+    for out in [args.output, args.baseline if args.write_baseline else None]:
+        if out:
+            out.write_text(json.dumps(report, indent=1))
+            print(f"wrote {out}")
@@ -0,0 +1,165 @@
+"""
+Per-throw-box recognizer: HOG features (numpy) and a linear (ridge) classifier
+over the symbols a throw box can show, trained on data/images and
+data/labels.csv. All 21 boxes of a game go through one matrix product.
+
+    python -m result_ocr.cells train     # fit on every labelled image, save cells.npz
+    python -m result_ocr.cells eval      # leave-one-image-out accuracy and speed
+
+The screen draws a strike in the second box of frames 1-9 and leaves the
+first one blank, and a two-ball 10th leaves its middle box blank, so ""
+is a class of its own.
+"""
+import argparse
+import hashlib
+import threading
+import time
+from pathlib import Path
+import cv2
+import numpy as np
+from .preprocess import to_gray
+
+SYMBOLS = ("", "1", "2", "3", "4", "5", "6", "7", "8", "9", "X", "/", "-", "F")
+MODEL = Path(__file__).with_name("cells.npz")
+SIZE = 32     # boxes are resized to SIZE x SIZE before HOG
+CELL = 8      # HOG cell side, px; blocks are 2x2 cells
+BINS = 9      # unsigned gradient orientations
+RIDGE = 0.1
+
+_weights = None
+_weights_lock = threading.Lock()
+
+def hog(imgs: np.ndarray) -> np.ndarray:
+    """HOG descriptors for a stack of (n, SIZE, SIZE) grey images, all at once."""
+    imgs = imgs.astype(np.float32)
+    gx = np.zeros_like(imgs)
+    gy = np.zeros_like(imgs)
+    gx[:, :, 1:-1] = imgs[:, :, 2:] - imgs[:, :, :-2]
+    gy[:, 1:-1] = imgs[:, 2:] - imgs[:, :-2]
+    mag = np.hypot(gx, gy)
+    b = (np.arctan2(gy, gx) % np.pi * (BINS / np.pi)).astype(np.int64) % BINS
+    n, c = len(imgs), SIZE // CELL
+    # per-cell orientation histograms: (n, c, c, BINS)
+    hist = np.zeros((n, c, c, BINS), np.float32)
+    cell = np.arange(SIZE) // CELL
+    idx = np.broadcast_to(np.arange(n)[:, None, None], b.shape)
+    np.add.at(hist, (idx, cell[None, :, None], cell[None, None, :], b), mag)
+    # 2x2-cell blocks, L2-normalised
+    blocks = np.concatenate([hist[:, :-1, :-1], hist[:, :-1, 1:],
+                             hist[:, 1:, :-1], hist[:, 1:, 1:]], axis=3)
+    blocks /= np.sqrt((blocks ** 2).sum(3, keepdims=True)) + 1e-6
+    return blocks.reshape(n, -1)
+
+def features(crops: list[np.ndarray]) -> np.ndarray:
+    """(n, d + 1) HOG rows with a bias column, one per box crop (BGR or grey)."""
+    small = [cv2.resize(c, (SIZE, SIZE), interpolation=cv2.INTER_AREA) for c in crops]
+    imgs = np.stack([to_gray(c) if c.ndim == 3 else c for c in small])
+    d = hog(imgs)
+    return np.hstack([d, np.ones((len(d), 1), np.float32)])
+
+def fit(X: np.ndarray, y: np.ndarray, ridge: float = RIDGE) -> np.ndarray:
+    """One-vs-rest ridge regression weights, (d + 1, len(SYMBOLS))."""
+    Y = np.eye(len(SYMBOLS), dtype=np.float64)[y]
+    A = X.T.astype(np.float64) @ X + ridge * np.eye(X.shape[1])
+    return np.linalg.solve(A, X.T.astype(np.float64) @ Y).astype(np.float32)
+
+def weights() -> np.ndarray:
+    """The saved model, loaded once per process."""
+    global _weights
+    if _weights is None:
+        with _weights_lock:
+            if _weights is None:
+                _weights = np.load(MODEL)["W"]
+    return _weights
+
+def model_id() -> str:
+    """Changes whenever the saved model does (part of the OCR cache key)."""
+    return hashlib.sha256(MODEL.read_bytes()).hexdigest()[:12]
+
+def box_symbols(frames: list[str]) -> list[list[str]]:
+    """Per-frame strings -> what each throw box shows (2 per frame, 3 in the 10th)."""
+    out = []
+    for i, f in enumerate(frames):
+        if i < 9:
+            out.append(["", "X"] if f == "X" else [f[:1], f[1:2]])
+        elif len(f) == 2:
+            out.append([f[0], "", f[1]])  # a two-ball 10th uses the outer boxes
+        else:
+            out.append([f[:1], f[1:2], f[2:3]])
+    return out
+
+def frame_strings(symbols: list[list[str]]) -> list[str]:
+    """Inverse of `box_symbols`: a strike is read from either box of frames 1-9."""
+    return ["X" if i < 9 and "X" in s else "".join(s) for i, s in enumerate(symbols)]
+
+def classify_scored(boxes: list[list[np.ndarray]],
+                    W: np.ndarray | None = None) -> tuple[list[str], list[float]]:
+    """
+    `classify`, plus a 0-1 confidence per frame: the smallest margin
+    between the best and the runner-up symbol score over its boxes.
+    """
+    flat = [b for f in boxes for b in f]
+    scores = features(flat) @ (weights() if W is None else W)
+    top = np.sort(scores, 1)
+    margin = np.clip(top[:, -1] - top[:, -2], 0, 1)
+    labels = iter(SYMBOLS[k] for k in scores.argmax(1))
+    ends = np.cumsum([len(f) for f in boxes])
+    confidence = [float(margin[e - len(f):e].min()) for f, e in zip(boxes, ends)]
+    return frame_strings([[next(labels) for _ in f] for f in boxes]), confidence
+
+def classify(boxes: list[list[np.ndarray]], W: np.ndarray | None = None) -> list[str]:
+    """Per-frame strings from the throw-box crops of one game (`Pipeline.boxes`)."""
+    return classify_scored(boxes, W)[0]
+
+def training_set(directory="data/images"):
+    """(X, y, image index) for every throw box of every labelled image."""
+    from .batch import image_paths
+    from .labels import load_labels, label_for
+    from .ocr import Pipeline, decode
+    labels = load_labels()
+    X, y, groups = [], [], []
+    for path in image_paths(directory):
+        truth = label_for(path, labels)
+        if not truth or not "".join(truth):
+            continue
+        pipe = Pipeline(decode(path))
+        crops = [b for f in pipe.boxes for b in f]
+        syms = [s for f in box_symbols(truth) for s in f]
+        X.append(features(crops))
+        y += [SYMBOLS.index(s) for s in syms]
+        groups += [len(X) - 1] * len(syms)
+    return np.vstack(X), np.array(y), np.array(groups)
+
+def evaluate(X, y, groups, ridge: float = RIDGE):
+    """Leave-one-image-out box and game accuracy."""
+    hits, games = 0, 0
+    for g in np.unique(groups):
+        test = groups == g
+        pred = (X[test] @ fit(X[~test], y[~test], ridge)).argmax(1)
+        hits += (pred == y[test]).sum()
+        games += (pred == y[test]).all()
+    n = len(np.unique(groups))
+    print(f"ridge {ridge:g}: box accuracy {hits / len(y):.1%} ({hits}/{len(y)}), "
+          f"games with every box right {games}/{n}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Train/evaluate the throw-box classifier")
+    ap.add_argument("cmd", choices=["train", "eval"])
+    ap.add_argument("directory", nargs="?", default="data/images")
+    ap.add_argument("--ridge", type=float, default=RIDGE)
+    args = ap.parse_args()
+
+    X, y, groups = training_set(args.directory)
+    if args.cmd == "eval":
+        from .batch import image_paths
+        from .ocr import Pipeline, decode
+        evaluate(X, y, groups, args.ridge)
+        W = fit(X, y, args.ridge)
+        boxes = Pipeline(decode(image_paths(args.directory)[0])).boxes
+        t = time.perf_counter()
+        for _ in range(100):
+            classify(boxes, W)
+        print(f"{(time.perf_counter() - t) * 10:.2f} ms per game (21 boxes)")
+    else:
+        np.savez_compressed(MODEL, W=fit(X, y, args.ridge))
+        print(f"{len(y)} boxes from {len(np.unique(groups))} images -> {MODEL}")
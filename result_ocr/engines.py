@@ -0,0 +1,109 @@
+"""
+OCR engines for one binarised image. Each engine returns plain text; the
+tesseract-based ones can also return per-character boxes in tesseract's
+box format ("<char> <x1> <y1> <x2> <y2> <page>" per line). `SCORED`
+reads the same engines with a 0-1 confidence (the weakest word's).
+
+    tesseract  pytesseract: a tesseract subprocess + temp image per call
+    tesserocr  one resident TessBaseAPI per process, fed raw numpy buffers
+               (optional dependency: pip install tesserocr)
+    easyocr    CPU deep-learning reader, loaded on first use
+"""
+import importlib.util
+import shutil
+import sys
+import threading
+from functools import partial
+import numpy as np
+import pytesseract
+
+WHITELIST = '123456789X/-F'
+CONFIG = f'--psm 7 -c tessedit_char_whitelist={WHITELIST}'
+EASYOCR_KW = dict(paragraph=False, mag_ratio=2.0, text_threshold=0.4,
+                  low_text=0.3, link_threshold=0.3)
+
+# engine -> package it imports on first use
+OPTIONAL = {"tesserocr": "tesserocr", "easyocr": "easyocr"}
+
+_reader = None
+_reader_lock = threading.Lock()
+_api = None
+_api_lock = threading.Lock()
+
+def get_reader():
+    """
+    The process-wide easyocr Reader. Importing easyocr and loading its
+    PyTorch models is slow, so it only happens the first time a frame
+    actually needs the fallback.
+    """
+    global _reader
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                import easyocr
+                _reader = easyocr.Reader(['en'], gpu=False)
+    return _reader
+
+def tesseract_available() -> bool:
+    return shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
+def importable(name: str) -> bool:
+    """Whether engine `name`'s Python package is installed (tesseract's binary aside)."""
+    module = OPTIONAL.get(name)
+    return module is None or module in sys.modules or importlib.util.find_spec(module) is not None
+
+def warm_up(background: bool = True):
+    """Build the easyocr reader ahead of its first use, by default on a daemon thread."""
+    if background:
+        threading.Thread(target=get_reader, daemon=True).start()
+    else:
+        get_reader()
+
+def easyocr_scored(masks: list[np.ndarray]) -> list[tuple[str, float]]:
+    """easyocr (text, confidence) for several masks with one batched recognizer call."""
+    res = get_reader().readtext_batched(
+        masks, n_width=max(m.shape[1] for m in masks),
+        n_height=max(m.shape[0] for m in masks), detail=1, **EASYOCR_KW)
+    return [(''.join(t for _, t, _ in r).replace(' ',''), min((c for *_, c in r), default=0.0))
+            for r in res]
+
+def easyocr_batch(masks: list[np.ndarray]) -> list[str]:
+    """`easyocr_scored` without the confidences."""
+    return [text for text, _ in easyocr_scored(masks)]
+
+def _tesseract_scored(mask: np.ndarray) -> tuple[str, float]:
+    d = pytesseract.image_to_data(mask, config=CONFIG, output_type=pytesseract.Output.DICT)
+    words = [(t.strip(), float(c)) for t, c in zip(d["text"], d["conf"])
+             if float(c) >= 0 and t.strip()]
+    return ''.join(t for t, _ in words), min((c for _, c in words), default=0.0) / 100
+
+def _tesserocr(mask: np.ndarray, boxes: bool | None):
+    """Text, box text (`boxes`) or (text, confidence) (`boxes=None`) from the resident API."""
+    global _api
+    mask = np.ascontiguousarray(mask, dtype=np.uint8)
+    h, w = mask.shape
+    # TessBaseAPI is not thread-safe; Streamlit sessions share this one
+    with _api_lock:
+        if _api is None:
+            import tesserocr
+            _api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE)
+            _api.SetVariable("tessedit_char_whitelist", WHITELIST)
+        _api.SetImageBytes(mask.tobytes(), w, h, 1, w)
+        if boxes is None:
+            return _api.GetUTF8Text().strip().replace(' ',''), min(_api.AllWordConfidences(), default=0) / 100
+        return _api.GetBoxText(0) if boxes else _api.GetUTF8Text()
+
+# name -> (text(mask), boxes(mask) or None)
+ENGINES = {
+    "tesseract": (partial(pytesseract.image_to_string, config=CONFIG),
+                  partial(pytesseract.image_to_boxes, config=CONFIG)),
+    "tesserocr": (partial(_tesserocr, boxes=False), partial(_tesserocr, boxes=True)),
+    "easyocr":   (lambda mask: easyocr_batch([mask])[0], None),
+}
+
+# name -> scored(mask) -> (text, confidence 0-1)
+SCORED = {
+    "tesseract": _tesseract_scored,
+    "tesserocr": partial(_tesserocr, boxes=None),
+    "easyocr":   lambda mask: easyocr_scored([mask])[0],
+}
@@ -0,0 +1,26 @@
+"""Ground truth for the images in data/images, from data/labels.csv."""
+import csv
+import re
+from datetime import datetime
+from pathlib import Path
+
+LABELS = Path(__file__).resolve().parent.parent / "data" / "labels.csv"
+_NAME = re.compile(r"(\d{8})-game(\d+)", re.IGNORECASE)
+
+def load_labels(path=LABELS) -> dict[tuple[str, int], list[str]]:
+    """(yyyymmdd, game) -> ten per-frame strings, e.g. ["7/", "8-", ..., "33"]."""
+    out = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if not row["Date"]:
+                continue
+            day = datetime.strptime(row["Date"], "%m/%d/%Y").strftime("%Y%m%d")
+            frames = [row[f"Frame{i}-1"] + row[f"Frame{i}-2"] for i in range(1, 10)]
+            frames.append(row["Frame10-1"] + row["Frame10-2"] + row["Frame10-3"])
+            out[(day, int(row["Game"]))] = frames
+    return out
+
+def label_for(path, labels: dict) -> list[str] | None:
+    """Ground truth for an image named like 20250612-game3.jpg, if labelled."""
+    m = _NAME.search(Path(path).stem)
+    return labels.get((m.group(1), int(m.group(2)))) if m else None
@@ -1,93 +1,330 @@
+import time
+import cv2
 import pytesseract
-import easyocr
 import numpy as np
-from .preprocess import to_gray, remove_red_circles, preprocess_for_ocr
-from .deskew      import detect_skew_by_hough, rotate
-from .segment     import crop_row, split_frames
+from .preprocess import to_gray, red_mask, remove_red_circles, preprocess_for_ocr, ocr_variants
+from .deskew      import detect_skew_by_hough, detect_skew_fast, downscale, rotate_band
+from .segment     import Grid, crop_row, row_bounds, find_grid, fixed_grid
+from .scoring     import Game, frame_is_legal
+from .engines     import ENGINES, SCORED, easyocr_scored, importable, tesseract_available, warm_up
+from .cells       import classify_scored
+from .            import profiling
 
-CONFIG = '--psm 7 -c tessedit_char_whitelist=123456789X/-F'
-_reader = easyocr.Reader(['en'], gpu=False)
+SEP = 24  # px of background between frames stitched into one strip
+# "fast": projection profile on a downscaled copy of the whole photo;
+# "hough": full-resolution HoughLines on the row band only
+DESKEW = "fast"
+# "grid": frame boxes found on the screen; "fixed": ROW_BAND cut in ten
+SEGMENT = "grid"
+# engines.ENGINES read whole frames; "cells" classifies each throw box
+RECOGNIZERS = (*ENGINES, "cells")
+# an engine is missing when its binary or its optional package is not installed
+_MISSING = (pytesseract.pytesseract.TesseractNotFoundError, ImportError)
+# "ambiguous": re-read frames that are empty, not a legal frame or read
+# with confidence below CONF_MIN, on other thresholds and then easyocr;
+# "empty": only empty frames, straight to easyocr
+FALLBACK = "ambiguous"
+CONF_MIN = 0.6
+# match the Streamlit preview (PIL), which does not apply EXIF rotation
+_IMREAD = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
 
-def _ocr_image(mask: np.ndarray) -> str:
+def recognizers() -> tuple[str, ...]:
+    """The `RECOGNIZERS` whose packages are installed here."""
+    return tuple(r for r in RECOGNIZERS if importable(r))
+
+def decode(src) -> np.ndarray:
+    """BGR image from a path or from encoded (uploaded) bytes."""
+    if isinstance(src, (bytes, bytearray)):
+        return cv2.imdecode(np.frombuffer(src, np.uint8), _IMREAD)
+    return cv2.imread(str(src), _IMREAD)
+
+def _read(mask: np.ndarray, engine: str = "tesseract") -> tuple[str, float]:
+    """(text, confidence) for one frame mask; ("", 0.0) if the engine is not installed."""
     try:
-        txt = pytesseract.image_to_string(mask, config=CONFIG).strip().replace(' ','')
-        if txt:
-            return txt
-    except pytesseract.pytesseract.TesseractNotFoundError:
-        pass
-    res = _reader.readtext(mask, detail=0, paragraph=False,
-                           mag_ratio=2.0, text_threshold=0.4,
-                           low_text=0.3, link_threshold=0.3)
-    return ''.join(res).replace(' ','')
-
-def run_pipeline(img: np.ndarray) -> list[str]:
-    row  = crop_row(img)
-    gray = to_gray(remove_red_circles(row))
-    angle= detect_skew_by_hough(gray)
-    img2 = rotate(img, angle)
-    row2 = crop_row(img2)
-    outs = []
-    for fr in split_frames(row2):
-        clean = remove_red_circles(fr)
-        g     = to_gray(clean)
-        m     = preprocess_for_ocr(g)
-        outs.append(_ocr_image(m))
-    return outs
+        with profiling.span(f"engine:{engine}"):
+            return SCORED[engine](mask)
+    except _MISSING:
+        profiling.count("engine_missing", engine=engine)
+        return "", 0.0
 
-def compute_bowling_stats_from_string(game_str: str) -> dict:
+def _ambiguous(text: str, confidence: float | None, i: int) -> bool:
+    return (not frame_is_legal(text, tenth=i == 9)
+            or (confidence is not None and confidence < CONF_MIN))
+
+def _needs_fallback(text, confidence, i, fallback) -> bool:
+    return not text if fallback == "empty" else _ambiguous(text, confidence, i)
+
+def _resolve(pending, grays, masks, engine: str = "tesseract", fallback: str = FALLBACK):
     """
-    Safely score a 10‐frame bowling string via the numeric rolls list,
-    avoiding any indexing of the raw string.
+    Re-read the frames in `pending`, (frame index, text, confidence) each:
+    `engine` on the frame's `ocr_variants` first ("ambiguous" only), then
+    easyocr on the ones still ambiguous in one batched call. Yields like
+    `Pipeline.stream`; when no reading is convincing the best one is kept,
+    legal frames first, then by confidence.
     """
-     # 1) Build full roll list
-    rolls = []
-    for ch in game_str:
-        if ch == "X":
-            rolls.append(10)
-        elif ch == "/":
-            # spare: make up to 10
-            rolls.append(10 - rolls[-1])
-        elif ch in "-F":  # miss or foul
-            rolls.append(0)
+    def best(*reads):
+        return max(reads, key=lambda r: (frame_is_legal(r[1], r[0] == 9), r[2] or 0.0))
+    left = []
+    for i, text, conf in pending:
+        profiling.count("fallback", engine=engine)
+        kept = (i, text, conf, engine)
+        for v in ocr_variants(grays[i]) if fallback != "empty" else []:
+            read = (i, *_read(v, engine), f"{engine}+alt")
+            if not _ambiguous(read[1], read[2], i):
+                yield read
+                break
+            kept = best(kept, read)
         else:
-            rolls.append(int(ch))
-
-    total, strikes, spares = 0, 0, 0
-    pins_in_frame = 0
-    roll_idx = 0
-
-    # 2) Walk frame by frame
-    for frame in range(1, 11):
-        if game_str[roll_idx] == "X":
-            # Strike frame
-            strikes += 1
-            total += 10
-            # bonus: next two rolls
-            total += rolls[roll_idx + 1] if roll_idx + 1 < len(rolls) else 0
-            total += rolls[roll_idx + 2] if roll_idx + 2 < len(rolls) else 0
-            pins_in_frame += 10
-            roll_idx += 1
+            left.append(kept)
+    if left:
+        with profiling.span("engine:easyocr", frames=len(left)):
+            reads = easyocr_scored([masks[i] for i, *_ in left])
+        for kept, (text, conf) in zip(left, reads):
+            read = (kept[0], text, conf, "easyocr")
+            yield read if fallback == "empty" else best(kept, read)
 
+def _stitch(masks: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Masks side by side with SEP-wide gaps; also the x where each frame's slot starts."""
+    h = max(m.shape[0] for m in masks)
+    gap = np.zeros((h, SEP), np.uint8)
+    parts, starts, x = [], [], 0
+    for m in masks:
+        m = np.pad(m, ((0, h - m.shape[0]), (0, 0)))
+        starts.append(x)  # the gap before a frame belongs to it
+        parts += [gap, m]
+        x += SEP + m.shape[1]
+    return np.hstack(parts + [gap]), np.array(starts)
+
+def _stream_strip(masks: list[np.ndarray], grays: list[np.ndarray],
+                  engine: str = "tesseract", fallback: str = FALLBACK):
+    """
+    OCR all frame masks of a row with one tesseract call on a stitched strip,
+    splitting the characters back into frames by their box x-position.
+    Yields (frame index, text, confidence, engine) for the frames the strip
+    call read, then the rest once `_resolve` has re-read them. The strip
+    call gives no per-frame confidence, so only the frame grammar decides.
+    """
+    _, to_boxes = ENGINES[engine]
+    if not to_boxes:  # easyocr: one batched call over the frames instead
+        with profiling.span("engine:easyocr", frames=len(masks)):
+            reads = easyocr_scored(masks)
+        for i, (text, conf) in enumerate(reads):
+            yield i, text, conf, engine
+        return
+    strip, starts = _stitch(masks)
+    outs = [''] * len(masks)
+    try:
+        with profiling.span(f"engine:{engine}", frames=len(masks)):
+            boxes = to_boxes(strip)
+    except _MISSING:
+        profiling.count("engine_missing", engine=engine)
+        boxes = ''
+    # each line: "<char> <x1> <y1> <x2> <y2> <page>"
+    for line in boxes.splitlines():
+        ch, x1, _, x2, *_ = line.split(' ')
+        i = int(np.searchsorted(starts, (int(x1) + int(x2)) / 2, side='right')) - 1
+        outs[max(i, 0)] += ch
+    pending = []
+    for i, o in enumerate(outs):
+        if not _needs_fallback(o, None, i, fallback):
+            yield i, o, None, engine
         else:
-            # Two‐ball frame (might be spare)
-            first = rolls[roll_idx]
-            second = rolls[roll_idx + 1] if roll_idx + 1 < len(rolls) else 0
-
-            if first + second == 10:
-                # Spare
-                spares += 1
-                total += 10
-                # bonus: next one roll
-                total += rolls[roll_idx + 2] if roll_idx + 2 < len(rolls) else 0
+            pending.append((i, o, None))
+    yield from _resolve(pending, grays, masks, engine, fallback)
+
+def _stream_frames(masks: list[np.ndarray], grays: list[np.ndarray],
+                   engine: str = "tesseract", fallback: str = FALLBACK):
+    for i, m in enumerate(masks):
+        text, conf = _read(m, engine)
+        if engine != "easyocr" and _needs_fallback(text, conf, i, fallback):
+            yield from _resolve([(i, text, conf)], grays, masks, engine, fallback)
+        else:
+            yield i, text, conf, engine
+
+def _stream_cells(boxes: list[list[np.ndarray]]):
+    texts, confidence = classify_scored(boxes)
+    for i, (text, c) in enumerate(zip(texts, confidence)):
+        yield i, text, c, "cells"
+
+class Pipeline:
+    """
+    One image on its way through the OCR pipeline. Every stage is computed
+    on first access and kept, so the UI preview and the OCR share the work
+    and no stage runs twice per image. `timings` holds seconds spent in
+    each stage itself (excluding the earlier stages it pulled in) and
+    `answered` the engine that produced each frame's prediction. Stages
+    are also reported to `profiling` when a sink is installed.
+
+        small -> angle -> grid -> clean_deskewed -> frames / boxes -> grays -> masks
+
+    `clean_deskewed` is `clean_row` (row -> red -> clean_row) when neither
+    rotation nor grid moved the row, else a freshly cut band. `deskew`
+    and `segment` pick the skew detector and the segmenter, see `DESKEW`
+    and `SEGMENT`.
+    """
+    def __init__(self, img: np.ndarray, deskew: str = DESKEW, segment: str = SEGMENT):
+        self.img = img
+        self.deskew = deskew
+        self.segment = segment
+        self.timings = {}
+        self.answered = []
+        self._stages = {}
+        self._streams = {}  # OCR key -> (frames yielded so far, recognizer generator)
+        self._nested = 0.0  # time spent in stages pulled in by the running one
+
+    def _stage(self, name, fn):
+        if name not in self._stages:
+            outer, self._nested = self._nested, 0.0
+            with profiling.span(name):
+                t = time.perf_counter()
+                self._stages[name] = fn()
+                total = time.perf_counter() - t
+            self.timings[name] = total - self._nested
+            self._nested = outer + total
+        return self._stages[name]
+
+    @property
+    def row(self) -> np.ndarray:
+        return self._stage("row", lambda: crop_row(self.img))
+
+    @property
+    def red(self) -> np.ndarray:
+        """Red-circle mask of the (un-rotated) row."""
+        return self._stage("red", lambda: red_mask(self.row))
+
+    @property
+    def clean_row(self) -> np.ndarray:
+        return self._stage("clean_row", lambda: remove_red_circles(self.row, self.red))
+
+    @property
+    def small(self) -> np.ndarray:
+        """The photo shrunk for skew and grid detection."""
+        return self._stage("small", lambda: downscale(self.img))
+
+    @property
+    def angle(self) -> float:
+        def run():
+            if self.deskew == "hough":
+                return detect_skew_by_hough(to_gray(self.clean_row))
+            # shrunk before the grey conversion, which is slow at 12MP
+            return detect_skew_fast(to_gray(self.small))
+        return self._stage("angle", run)
+
+    @property
+    def grid(self) -> Grid:
+        """Throw-row, frame and throw-box ROIs in the deskewed image."""
+        def run():
+            if self.segment == "fixed":
+                return fixed_grid(*self.img.shape[:2])
+            return find_grid(self.img, self.angle, self.small)
+        return self._stage("grid", run)
+
+    @property
+    def clean_deskewed(self) -> np.ndarray:
+        """Throw row cut from the deskewed image, red circles removed (one inpaint)."""
+        def run():
+            y0, y1 = self.grid.row
+            if self.angle == 0 and (y0, y1) == row_bounds(self.img.shape[0]):
+                return self.clean_row
+            if self.angle == 0:
+                return remove_red_circles(self.img[y0:y1])
+            # rotate(img, a) adds a skew of `a`; undo the detected one
+            return remove_red_circles(rotate_band(self.img, -self.angle, y0, y1))
+        return self._stage("clean_deskewed", run)
+
+    @property
+    def frames(self) -> list[np.ndarray]:
+        return self._stage("frames", lambda: [self.clean_deskewed[:, x0:x1]
+                                              for x0, _, x1, _ in self.grid.frames])
+
+    @property
+    def boxes(self) -> list[list[np.ndarray]]:
+        """Per frame, one crop per throw box (three in the 10th)."""
+        return self._stage("boxes", lambda: [[self.clean_deskewed[:, x0:x1] for x0, _, x1, _ in f]
+                                             for f in self.grid.boxes])
+
+    @property
+    def grays(self) -> list[np.ndarray]:
+        return self._stage("grays", lambda: [to_gray(f) for f in self.frames])
+
+    @property
+    def masks(self) -> list[np.ndarray]:
+        """Binarised mask per frame, ready for OCR."""
+        return self._stage("masks", lambda: [preprocess_for_ocr(g) for g in self.grays])
+
+    def stream(self, batched: bool = True, engine: str = "tesseract", fallback: str = FALLBACK):
+        """
+        `predictions` frame by frame: yields (frame index, prediction,
+        confidence or None, engine that answered) as each frame is read.
+        Strip OCR yields the frames its one call read before the ones left
+        to the easyocr fallback, so frames can come out of order. A stream
+        abandoned half-way (a Streamlit rerun) resumes where it stopped on
+        the next call; a finished one is kept like any other stage.
+        """
+        batched = batched and engine != "cells"
+        key = f"ocr:{engine}{':strip' if batched else ''}"
+        if engine != "cells" and fallback != FALLBACK:
+            key += f":{fallback}"
+        if key in self._stages:
+            yield from self._stages[key]
+            return
+        if key not in self._streams:
+            if engine == "cells":
+                work = _stream_cells(self.boxes)
             else:
-                # Open frame
-                total += first + second
-
-            pins_in_frame += first + second
-            roll_idx += 2
-    return {
-        "Total":    total,
-        "Pins":     pins_in_frame,
-        "Strikes":  strikes,
-        "Spares":   spares
-    }
\ No newline at end of file
+                work = (_stream_strip if batched else _stream_frames)(
+                    self.masks, self.grays, engine, fallback)
+            self._streams[key] = ([], work)
+        done, work = self._streams[key]
+        yield from list(done)
+        while True:
+            # time the recognizer only, not the caller's work between frames
+            with profiling.span(key):
+                t = time.perf_counter()
+                try:
+                    item = next(work, None)
+                except Exception:
+                    del self._streams[key]
+                    raise
+                self.timings[key] = self.timings.get(key, 0.0) + time.perf_counter() - t
+            if item is None:
+                break
+            done.append(item)
+            i, text, _, answered = item
+            profiling.event("frame", frame=i + 1, engine=answered, text=text)
+            yield item
+        self._streams.pop(key, None)
+        self._stages[key] = sorted(done)
+        self.answered = [e for *_, e in self._stages[key]]
+
+    def predictions(self, batched: bool = True, engine: str = "tesseract",
+                    fallback: str = FALLBACK) -> list[str]:
+        """
+        Per-frame strings. `batched` reads all ten frames with one recognizer
+        call; False OCRs each frame separately. `engine` is one of
+        `RECOGNIZERS`; `fallback` picks the frames the OCR engines re-read,
+        see `FALLBACK`. "cells" ignores both: it always classifies all 21
+        boxes at once.
+        """
+        return [text for _, text, _, _ in sorted(self.stream(batched, engine, fallback))]
+
+def frame_masks(img: np.ndarray) -> list[np.ndarray]:
+    """Deskewed, red-circle-free, binarised mask for each of the ten frames."""
+    return Pipeline(img).masks
+
+def run_pipeline(img: np.ndarray, batched: bool = True, engine: str = "tesseract",
+                 fallback: str = FALLBACK) -> list[str]:
+    """Per-frame strings for a score-sheet photo; see `Pipeline.predictions`."""
+    return Pipeline(img).predictions(batched, engine, fallback)
+
+def stream_pipeline(img: np.ndarray, batched: bool = True, engine: str = "tesseract",
+                    fallback: str = FALLBACK):
+    """`run_pipeline` yielding each frame as it is read; see `Pipeline.stream`."""
+    return Pipeline(img).stream(batched, engine, fallback)
+
+def compute_bowling_stats_from_string(game_str: str) -> dict:
+    """
+    Score a single 10-frame bowling string.
+    Use `scoring.score_games` for whole columns.
+    """
+    return Game(game_str).stats()
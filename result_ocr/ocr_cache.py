@@ -0,0 +1,86 @@
+"""
+Content-addressed cache of OCR predictions.
+
+Keys are sha256(pipeline config + uploaded image bytes), so an identical
+upload or a Streamlit rerun returns instantly. The config includes
+PIPELINE_VERSION: bump it whenever preprocessing/deskew/segmentation
+changes and every old entry simply stops matching.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from . import cells, engines
+from .ocr import Pipeline, decode, SEP, DESKEW, SEGMENT, FALLBACK, CONF_MIN
+
+PIPELINE_VERSION = 5
+MAX_ENTRIES = 64   # in-memory LRU size
+DISK_DIR = Path(__file__).resolve().parent.parent / ".cache" / "ocr"  # None: memory only
+
+_lru = OrderedDict()
+_lock = threading.Lock()
+
+def config(batched: bool = True, engine: str = "tesseract", fallback: str = FALLBACK) -> dict:
+    """Everything besides the image that can change the predictions."""
+    return {"version": PIPELINE_VERSION, "batched": batched, "engine": engine,
+            "sep": SEP, "deskew": DESKEW, "segment": SEGMENT,
+            "fallback": fallback, "conf_min": CONF_MIN,
+            "tesseract": engines.CONFIG, "easyocr": engines.EASYOCR_KW,
+            "cells": cells.model_id() if engine == "cells" else None}
+
+def key_for(data: bytes, **cfg) -> str:
+    h = hashlib.sha256(json.dumps(config(**cfg), sort_keys=True).encode())
+    h.update(data)
+    return h.hexdigest()
+
+def get(key: str) -> list[str] | None:
+    with _lock:
+        if key in _lru:
+            _lru.move_to_end(key)
+            return list(_lru[key])
+    path = DISK_DIR / f"{key}.json" if DISK_DIR else None
+    if path and path.exists():
+        preds = json.loads(path.read_text())
+        put(key, preds, disk=False)
+        return preds
+    return None
+
+def put(key: str, preds: list[str], disk: bool = True):
+    with _lock:
+        _lru[key] = list(preds)
+        _lru.move_to_end(key)
+        while len(_lru) > MAX_ENTRIES:
+            _lru.popitem(last=False)
+    if disk and DISK_DIR:
+        DISK_DIR.mkdir(parents=True, exist_ok=True)
+        (DISK_DIR / f"{key}.json").write_text(json.dumps(preds))
+
+def cached_pipeline(data: bytes, pipeline: Pipeline | None = None, **cfg) -> list[str]:
+    """
+    `run_pipeline` on encoded image bytes, served from the cache when possible.
+    Pass the `Pipeline` already built for these bytes to reuse its stages.
+    """
+    key = key_for(data, **cfg)
+    preds = get(key)
+    if preds is None:
+        preds = (pipeline or Pipeline(decode(data))).predictions(**cfg)
+        put(key, preds)
+    return preds
+
+def cached_stream(data: bytes, pipeline: Pipeline | None = None, **cfg):
+    """
+    `cached_pipeline` frame by frame (see `Pipeline.stream`). A cache hit
+    yields all ten frames at once, with engine "cache" and no confidence;
+    otherwise the predictions are cached once every frame is in.
+    """
+    key = key_for(data, **cfg)
+    preds = get(key)
+    if preds is not None:
+        yield from ((i, p, None, "cache") for i, p in enumerate(preds))
+        return
+    frames = []
+    for item in (pipeline or Pipeline(decode(data))).stream(**cfg):
+        frames.append(item)
+        yield item
+    put(key, [p for _, p, _, _ in sorted(frames)])
@@ -6,18 +6,43 @@ def to_gray(img):
     b, g, r = cv2.split(img)
     return (W[0]*r + W[1]*g + W[2]*b).astype(np.uint8)
 
-def remove_red_circles(bgr):
+def red_mask(bgr):
     hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
     m1 = cv2.inRange(hsv, (0,100,100), (10,255,255))
     m2 = cv2.inRange(hsv, (170,100,100), (180,255,255))
     red = cv2.bitwise_or(m1, m2)
-    red = cv2.morphologyEx(red, cv2.MORPH_CLOSE, np.ones((5,5),np.uint8))
+    return cv2.morphologyEx(red, cv2.MORPH_CLOSE, np.ones((5,5),np.uint8))
+
+def remove_red_circles(bgr, red=None):
+    if red is None:
+        red = red_mask(bgr)
+    if not red.any():
+        return bgr  # nothing to inpaint
     return cv2.inpaint(bgr, red, 3, cv2.INPAINT_TELEA)
 
-def preprocess_for_ocr(gray):
+def _thresholds(gray):
+    """(Otsu, closed adaptive Gaussian) binarisations, both inverted."""
     _, g1 = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV+cv2.THRESH_OTSU)
     g2 = cv2.adaptiveThreshold(gray, 255,
                 cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                 cv2.THRESH_BINARY_INV, 15, 2)
     g2 = cv2.morphologyEx(g2, cv2.MORPH_CLOSE, np.ones((3,3),np.uint8))
-    return g1 if g1.sum()>g2.sum() else g2
\ No newline at end of file
+    return g1, g2
+
+def preprocess_for_ocr(gray):
+    g1, g2 = _thresholds(gray)
+    return g1 if g1.sum()>g2.sum() else g2
+
+def ocr_variants(gray):
+    """
+    Other binarisations of a frame for a second OCR attempt, cheapest
+    first: the threshold `preprocess_for_ocr` did not pick, then a
+    coarser adaptive threshold and a blurred Otsu for noisy photos.
+    """
+    g1, g2 = _thresholds(gray)
+    g3 = cv2.adaptiveThreshold(gray, 255,
+                cv2.ADAPTIVE_THRESH_MEAN_C,
+                cv2.THRESH_BINARY_INV, 31, 8)
+    _, g4 = cv2.threshold(cv2.GaussianBlur(gray, (5,5), 0), 0, 255,
+                          cv2.THRESH_BINARY_INV+cv2.THRESH_OTSU)
+    return [g2 if g1.sum()>g2.sum() else g1, g3, g4]
@@ -0,0 +1,159 @@
+"""
+Opt-in instrumentation for the OCR pipeline: timed spans, counters and
+per-frame events sent to a pluggable sink (any callable taking a dict).
+
+    with profiling.collect(memory=True) as records:
+        run_pipeline(img)
+    print(profiling.to_json(records))
+
+    python -m result_ocr.profiling data/images/IMG_1.jpg --memory -o profile.json
+
+Nothing is recorded unless a sink is installed for the current thread;
+`span()` then hands back a shared no-op and `count()`/`event()` return
+straight away. Sinks are per thread so concurrent Streamlit sessions
+don't see each other's records.
+"""
+import argparse
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_local = threading.local()  # .sink, .memory, .stack of open spans
+
+class _Noop:
+    __slots__ = ()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+    def set(self, **fields):
+        pass
+
+_NOOP = _Noop()
+
+class _Span:
+    __slots__ = ("sink", "memory", "fields", "t0", "m0", "child_s", "child_kb")
+
+    def __init__(self, sink, memory, fields):
+        self.sink, self.memory, self.fields = sink, memory, fields
+        self.child_s = self.child_kb = 0.0
+
+    def set(self, **fields):
+        """Attach fields known only once the span has run."""
+        self.fields.update(fields)
+
+    def __enter__(self):
+        _local.stack.append(self)
+        self.m0 = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        secs = time.perf_counter() - self.t0
+        _local.stack.pop()
+        parent = _local.stack[-1] if _local.stack else None
+        # self_* excludes spans opened inside this one
+        rec = {"kind": "span", **self.fields, "seconds": secs,
+               "self_seconds": secs - self.child_s}
+        if parent:
+            parent.child_s += secs
+        if self.memory:
+            kb = (tracemalloc.get_traced_memory()[0] - self.m0) / 1024
+            rec["mem_kb"], rec["self_mem_kb"] = kb, kb - self.child_kb
+            if parent:
+                parent.child_kb += kb
+        if exc_type:
+            rec["error"] = exc_type.__name__
+        self.sink(rec)
+        return False
+
+def enabled() -> bool:
+    return getattr(_local, "sink", None) is not None
+
+def enable(sink, memory: bool = False):
+    """Send records from this thread to sink(record). `memory` traces allocations."""
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _local.sink, _local.memory, _local.stack = sink, memory, []
+
+def disable():
+    _local.sink, _local.memory = None, False
+
+def span(name: str, **fields):
+    """Context manager timing its body as one record named `name`."""
+    sink = getattr(_local, "sink", None)
+    if sink is None:
+        return _NOOP
+    return _Span(sink, _local.memory, {"name": name, **fields})
+
+def count(name: str, n: int = 1, **fields):
+    sink = getattr(_local, "sink", None)
+    if sink is not None:
+        sink({"kind": "count", "name": name, "n": n, **fields})
+
+def event(name: str, **fields):
+    sink = getattr(_local, "sink", None)
+    if sink is not None:
+        sink({"kind": "event", "name": name, **fields})
+
+@contextmanager
+def collect(memory: bool = False):
+    """Gather this thread's records into a list for the duration of the block."""
+    records = []
+    prev = (getattr(_local, "sink", None), getattr(_local, "memory", False),
+            getattr(_local, "stack", []))
+    was_tracing = tracemalloc.is_tracing()
+    enable(records.append, memory)
+    try:
+        yield records
+    finally:
+        _local.sink, _local.memory, _local.stack = prev
+        if memory and not was_tracing:
+            tracemalloc.stop()
+
+def summary(records: list[dict]) -> dict:
+    """
+    Per-span seconds (and net allocated KB), each excluding nested spans;
+    frames answered per engine; counter totals.
+    """
+    stages, engines, counts = {}, {}, {}
+    for r in records:
+        if r["kind"] == "span":
+            s = stages.setdefault(r["name"], {"calls": 0, "seconds": 0.0})
+            s["calls"] += 1
+            s["seconds"] += r["self_seconds"]
+            if "self_mem_kb" in r:
+                s["mem_kb"] = s.get("mem_kb", 0.0) + r["self_mem_kb"]
+        elif r["kind"] == "count":
+            counts[r["name"]] = counts.get(r["name"], 0) + r["n"]
+        elif r["name"] == "frame":
+            engines[r["engine"]] = engines.get(r["engine"], 0) + 1
+    return {"stages": stages, "engines": engines, "counts": counts}
+
+def to_json(records: list[dict]) -> str:
+    return json.dumps({"summary": summary(records), "records": records}, indent=2)
+
+if __name__ == "__main__":
+    from .ocr import Pipeline, decode, RECOGNIZERS
+    # the pipeline reports to the imported module, not to this __main__ copy
+    from .profiling import collect, event, to_json
+    ap = argparse.ArgumentParser(description="Profile the OCR pipeline and dump JSON")
+    ap.add_argument("images", nargs="+")
+    ap.add_argument("--engine", default="tesseract", choices=RECOGNIZERS)
+    ap.add_argument("--per-frame", action="store_true", help="one OCR call per frame")
+    ap.add_argument("--memory", action="store_true", help="also trace allocations")
+    ap.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = ap.parse_args()
+
+    with collect(memory=args.memory) as records:
+        for path in args.images:
+            event("image", path=str(path))
+            Pipeline(decode(path)).predictions(not args.per_frame, args.engine)
+    out = to_json(records)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
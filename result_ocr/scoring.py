@@ -0,0 +1,241 @@
+import re
+from itertools import accumulate
+import numpy as np
+import pandas as pd
+
+MAX_ROLLS = 21
+
+# ASCII code -> pins. "/" is resolved against the previous roll afterwards,
+# anything unknown (incl. the NUL padding of short strings) scores 0.
+_PINS = np.zeros(256, dtype=np.int8)
+_PINS[np.frombuffer(b"123456789", dtype=np.uint8)] = np.arange(1, 10)
+_PINS[ord("X")] = 10
+_SPARE = ord("/")
+# same mapping as a bytes.translate table for the per-game `Game` parser
+_ROLL = bytes(_PINS.astype(np.uint8))
+_STRIKE = ord("X")
+# frames 1-9 ("X" or two rolls as written), then frame 10 as the rest
+_FRAME_SPLIT = re.compile(r"(X|.{0,2})" * 9 + r"(.*)", re.S)
+
+
+def encode_games(game_strings) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode N game strings in one go.
+    Returns (chars, rolls, lengths): the (N x 21) uint8 character codes,
+    the (N x 21) int8 pins per roll and the number of rolls per game.
+    """
+    strs = pd.Series(game_strings, dtype=object).fillna("").astype(str)
+    # stray non-ASCII glyphs become "?" (0 pins), as in `Game`
+    chars = (
+        np.asarray(strs.str.encode("ascii", "replace").tolist(), dtype=f"S{MAX_ROLLS}")
+          .view(np.uint8)
+          .reshape(len(strs), MAX_ROLLS)
+    )
+    rolls = _PINS[chars]
+    # spare: make up to 10
+    spare = chars[:, 1:] == _SPARE
+    rolls[:, 1:][spare] = 10 - rolls[:, :-1][spare]
+    lengths = np.minimum(strs.str.len().to_numpy(dtype=np.int64), MAX_ROLLS)
+    return chars, rolls, lengths
+
+
+def frame_starts(chars: np.ndarray) -> np.ndarray:
+    """(N x 10) index of the first roll of every frame."""
+    n = chars.shape[0]
+    rows = np.arange(n)
+    starts = np.empty((n, 10), dtype=np.int64)
+    pos = np.zeros(n, dtype=np.int64)
+    for f in range(10):
+        starts[:, f] = pos
+        pos = pos + np.where(chars[rows, pos] == _STRIKE, 1, 2)
+    return starts
+
+
+def score_encoded(chars, rolls, lengths) -> dict[str, np.ndarray]:
+    """Score already-encoded games; see `score_games`."""
+    starts = frame_starts(chars)
+    # pad so that start+2 never runs off the matrix; padded rolls count as 0
+    padded = np.pad(rolls.astype(np.int16), ((0, 0), (0, 2)))
+    r0 = np.take_along_axis(padded, starts,     axis=1)
+    r1 = np.take_along_axis(padded, starts + 1, axis=1)
+    r2 = np.take_along_axis(padded, starts + 2, axis=1)
+
+    strike = np.take_along_axis(chars, starts, axis=1) == _STRIKE
+    spare  = ~strike & (r0 + r1 == 10)
+    frames = np.where(strike | spare, 10 + r2 + np.where(strike, r1, 0), r0 + r1)
+    pins   = np.where(strike, 10, r0 + r1)
+    return {
+        "Total":   frames.sum(axis=1),
+        "Pins":    pins.sum(axis=1),
+        "Strikes": strike.sum(axis=1),
+        "Spares":  spare.sum(axis=1),
+        "Frames":  frames,
+        # (N x 10) per-frame detail for callers that need more than totals
+        "First":   r0,
+        "Bonus":   frames - pins,
+        "Strike":  strike,
+        "Spare":   spare,
+        "Starts":  starts,
+    }
+
+
+def score_games(game_strings) -> pd.DataFrame:
+    """
+    Vectorised scorer for a column (or list) of 10-frame game strings.
+    Returns one row per game with Total, Pins, Strikes, Spares and the
+    per-frame scores F1..F10, indexed like the input when it is a Series.
+    """
+    index = game_strings.index if isinstance(game_strings, pd.Series) else None
+    res = score_encoded(*encode_games(game_strings))
+    out = pd.DataFrame(
+        {k: res[k] for k in ("Total", "Pins", "Strikes", "Spares")}, index=index
+    )
+    frames = pd.DataFrame(
+        res["Frames"], index=out.index, columns=[f"F{i}" for i in range(1, 11)]
+    )
+    return pd.concat([out, frames], axis=1)
+
+
+def _pair_ok(a: str, b: str) -> bool:
+    """Two balls of one frame: a miss/foul/count, then a count or a spare."""
+    if a not in "-F123456789" or b not in "-F123456789/" or not a or not b:
+        return False
+    return b == "/" or _PINS[ord(a)] + _PINS[ord(b)] <= 9
+
+
+def frame_is_legal(frame: str, tenth: bool = False) -> bool:
+    """
+    Whether `frame` is a complete frame as the score sheet writes it:
+    "X", or two balls knocking down at most 9 pins unless the second is
+    "/". The 10th adds a fill ball after a strike or spare.
+    """
+    f = str(frame)
+    if not tenth:
+        return f == "X" or (len(f) == 2 and _pair_ok(f[0], f[1]))
+    if len(f) == 2:
+        return f[1] != "/" and _pair_ok(f[0], f[1])
+    if len(f) != 3:
+        return False
+    fill = "X-F123456789"
+    if f[0] == "X":
+        return (f[1] == "X" and f[2] in fill) or _pair_ok(f[1], f[2])
+    return _pair_ok(f[0], f[1]) and f[1] == "/" and f[2] in fill
+
+
+class Game:
+    """
+    One game string. Totals and counts come from a single pass over its
+    rolls; per-frame strings and scores are only built when asked for.
+    """
+    __slots__ = ("string", "_rolls", "_totals", "_frames")
+
+    def __init__(self, game_str: str):
+        self.string = str(game_str)
+        self._rolls = self._totals = self._frames = None
+
+    @classmethod
+    def from_frames(cls, frames) -> "Game":
+        """Build from a list of per-frame strings, e.g. ["X", "7/", ..., "X9/"]."""
+        return cls("".join(str(f) for f in frames))
+
+    def _parse(self) -> tuple[bytes, bytes]:
+        """(character codes, pins per roll), zero-padded so i+2 never runs off the end."""
+        if self._rolls is None:
+            s = self.string
+            chars = s.encode("ascii", "replace").ljust(MAX_ROLLS + 2, b"\0")
+            rolls = chars.translate(_ROLL)
+            j = s.find("/")
+            if j >= 0:
+                rolls = bytearray(rolls)
+                while j >= 0:
+                    if j:
+                        rolls[j] = (10 - rolls[j - 1]) & 0xFF
+                    j = s.find("/", j + 1)
+            self._rolls = chars, rolls
+        return self._rolls
+
+    def _count(self) -> tuple[int, int, int, int]:
+        """(total, pins, strikes, spares) without any per-frame lists."""
+        if self._totals is None:
+            chars, rolls = self._parse()
+            i = total = pins = strikes = spares = 0
+            for _ in range(10):
+                if chars[i] == _STRIKE:
+                    strikes += 1
+                    total += 10 + rolls[i + 1] + rolls[i + 2]
+                    pins += 10
+                    i += 1
+                else:
+                    r = rolls[i] + rolls[i + 1]
+                    if r == 10:
+                        spares += 1
+                        total += 10 + rolls[i + 2]
+                    else:
+                        total += r
+                    pins += r
+                    i += 2
+            self._totals = total, pins, strikes, spares
+        return self._totals
+
+    def _score(self) -> tuple[list[int], list[int]]:
+        """(index of each frame's first roll, frame scores)."""
+        if self._frames is None:
+            chars, rolls = self._parse()
+            i, starts, scores = 0, [], []
+            for _ in range(10):
+                starts.append(i)
+                if chars[i] == _STRIKE:
+                    scores.append(10 + rolls[i + 1] + rolls[i + 2])
+                    i += 1
+                else:
+                    r = rolls[i] + rolls[i + 1]
+                    scores.append(r + rolls[i + 2] if r == 10 else r)
+                    i += 2
+            self._frames = starts, scores
+        return self._frames
+
+    @property
+    def frame_strs(self) -> list[str]:
+        """Rolls per frame as written; frame 10 is the rest of the string."""
+        return list(_FRAME_SPLIT.match(self.string).groups())
+
+    @property
+    def frame_scores(self) -> list[int]:
+        return self._score()[1]
+
+    @property
+    def cumulative(self) -> list[int]:
+        return list(accumulate(self._score()[1]))
+
+    @property
+    def bonuses(self) -> list[int]:
+        """Bonus pins earned by each frame (0 for open frames)."""
+        chars, rolls = self._parse()
+        return [score - (10 if chars[i] == _STRIKE else rolls[i] + rolls[i + 1])
+                for i, score in zip(*self._score())]
+
+    @property
+    def total(self) -> int:
+        return self._count()[0]
+
+    @property
+    def strikes(self) -> int:
+        return self._count()[2]
+
+    @property
+    def spares(self) -> int:
+        return self._count()[3]
+
+    @property
+    def pins(self) -> int:
+        """Pins knocked down in frames 1-10, excluding 10th-frame fill balls."""
+        return self._count()[1]
+
+    def stats(self) -> dict:
+        total, pins, strikes, spares = self._count()
+        return {
+            "Total":   total,
+            "Pins":    pins,
+            "Strikes": strikes,
+            "Spares":  spares,
+        }
@@ -1,8 +1,16 @@
+from typing import NamedTuple
+import cv2
 import numpy as np
+from .deskew import downscale, rotate
+
+ROW_BAND = (0.3, 0.59)  # score row, as a fraction of image height
+
+def row_bounds(h: int) -> tuple[int, int]:
+    return int(ROW_BAND[0]*h), int(ROW_BAND[1]*h)
 
 def crop_row(img: np.ndarray) -> np.ndarray:
-    h = img.shape[0]
-    return img[int(0.3*h):int(0.59*h), :]
+    y0, y1 = row_bounds(img.shape[0])
+    return img[y0:y1, :]
 
 def split_frames(img: np.ndarray) -> list[np.ndarray]:
     h,w = img.shape[:2]
@@ -10,4 +18,108 @@ def split_frames(img: np.ndarray) -> list[np.ndarray]:
     for i in range(10):
         x1 = int(i*w/10); x2 = int((i+1)*w/10)
         out.append(img[:, x1:x2])
-    return out
\ No newline at end of file
+    return out
+# --- grid detection -------------------------------------------------------
+# The scoring screen draws each frame as a bright box (throws on top, running
+# total below a thin rule) under a strip of frame-number tabs. Boxes are
+# found on a downscaled copy from the HSV value channel; row/column
+# projections of the box mask give the boxes, a horizontal-line opening
+# gives the rule under the throws.
+
+class Grid(NamedTuple):
+    """ROIs as (x0, y0, x1, y1) in the deskewed full-resolution image."""
+    row: tuple[int, int]                          # y0, y1 of the throw row
+    frames: list[tuple[int, int, int, int]]       # throw-row part of each frame
+    boxes: list[list[tuple[int, int, int, int]]]  # 2 throw boxes per frame, 3 in the 10th
+    found: bool                                   # False: fixed-band fallback
+
+def _runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    d = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return list(zip(np.flatnonzero(d == 1), np.flatnonzero(d == -1)))
+
+def _grid(row: tuple[int, int], xs: list[tuple[int, int]], found: bool) -> Grid:
+    y0, y1 = row
+    frames = [(x0, y0, x1, y1) for x0, x1 in xs]
+    boxes = []
+    for i, (x0, x1) in enumerate(xs):
+        n = 3 if i == 9 else 2
+        cuts = np.linspace(x0, x1, n + 1).round().astype(int)
+        boxes.append([(int(a), y0, int(b), y1) for a, b in zip(cuts[:-1], cuts[1:])])
+    return Grid((y0, y1), frames, boxes, found)
+
+def fixed_grid(h: int, w: int) -> Grid:
+    """The old layout: ROW_BAND of the height, ten equal slices."""
+    return _grid(row_bounds(h), [(int(i*w/10), int((i+1)*w/10)) for i in range(10)], False)
+
+def _find_grid(img: np.ndarray) -> tuple[tuple[int, int], list[tuple[int, int]]] | None:
+    h, w = img.shape[:2]
+    v = cv2.GaussianBlur(cv2.cvtColor(img, cv2.COLOR_BGR2HSV)[:, :, 2], (5, 5), 0)
+    # relative to the bright boxes, so the dimmer tabs and the gaps drop out
+    box = v > 0.85 * np.percentile(v, 90)
+    # score boxes: the tallest band of mostly-box rows
+    rows = box.mean(1)
+    runs = _runs(rows > 0.5)
+    if not runs:
+        return None
+    y0, y1 = max(runs, key=lambda r: r[1] - r[0])
+    if y1 - y0 < 0.3 * h:
+        return None
+    # frames: the boxes sit on a regular pitch. Glare merges neighbours and
+    # dark digits split them, so fit the pitch to the boxes of typical
+    # width and place all ten on it; the typical ones keep their own edges.
+    cols = cv2.blur(box[y0:y1].mean(0, dtype=np.float32)[None, :], (5, 1))[0]
+    runs = _runs(cols > 0.5)
+    if not runs:
+        return None
+    width = np.median([b - a for a, b in runs])
+    clean = [(a, b) for a, b in runs if 0.8 * width <= b - a <= 1.25 * width]
+    if len(clean) < 3:
+        return None
+    centres = np.array([(a + b) / 2 for a, b in clean])
+    d = np.diff(centres)
+    steps = np.maximum(np.round(d / d.min()), 1)
+    step = d.sum() / steps.sum()
+    k = np.round((centres - centres[0]) / step)
+    c0 = float(np.median(centres - k * step))
+    # the ten consecutive slots covering the most box
+    first = int(np.floor(-c0 / step))
+    last = int(np.ceil((w - c0) / step)) - 9
+    def cover(j):
+        return sum(cols[max(int(c0 + i*step - width/2), 0):max(int(c0 + i*step + width/2), 0)].sum()
+                   for i in range(j, j + 10))
+    j = max(range(first, max(last, first) + 1), key=cover)
+    frames = []
+    for i in range(j, j + 10):
+        c = c0 + i * step
+        own = [r for r in clean if abs((r[0] + r[1]) / 2 - c) < step / 4]
+        a, b = own[0] if own else (int(c - width / 2), int(c + width / 2))
+        frames.append((min(max(int(a), 0), w), min(max(int(b), 0), w)))
+    # throw row: box top down to the rule, a long thin bright line mid-box
+    gray = cv2.cvtColor(img[y0:y1], cv2.COLOR_BGR2GRAY)
+    thin = cv2.morphologyEx(gray, cv2.MORPH_TOPHAT, cv2.getStructuringElement(cv2.MORPH_RECT, (1, 7)))
+    line = cv2.morphologyEx(thin, cv2.MORPH_OPEN,
+                            cv2.getStructuringElement(cv2.MORPH_RECT, (max(int(width / 3), 3), 1)))
+    lo, hi = int(0.35 * (y1 - y0)), int(0.7 * (y1 - y0))
+    prof = line.mean(1)
+    sep = lo + int(np.argmax(prof[lo:hi])) if prof[lo:hi].max() > 1 else (y1 - y0) // 2
+    return (y0, y0 + sep), frames
+
+def find_grid(img: np.ndarray, angle: float = 0.0, small: np.ndarray | None = None) -> Grid:
+    """
+    Throw-row, frame and throw-box ROIs of `img` once deskewed by `angle`
+    (i.e. of rotate(img, -angle)), found on `small` (default: a
+    `downscale` of img) and scaled back up.
+    Falls back to `fixed_grid` when no grid of ten boxes is found.
+    """
+    h, w = img.shape[:2]
+    if small is None:
+        small = downscale(img)
+    if angle:
+        small = rotate(small, -angle)
+    found = _find_grid(small)
+    if found is None:
+        return fixed_grid(h, w)
+    (y0, y1), xs = found
+    fy, fx = h / small.shape[0], w / small.shape[1]
+    return _grid((int(y0 * fy), int(y1 * fy)),
+                 [(int(a * fx), int(b * fx)) for a, b in xs], True)
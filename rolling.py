@@ -0,0 +1,182 @@
+"""
+Rolling aggregates over sessions (one session = one date), per location
+and over all locations, kept as prefix sums of per-session sums and counts.
+
+    stats = RollingStats.from_frame(sessions, ["Spares", "Strikes", "Pins", "Total"])
+    stats.mean("Kai Tak", sessions=5)      # game-weighted mean of the last 5 sessions
+    stats.mean(days=30, end=some_date)     # ... of the 30 days up to some_date
+    stats.moving(5)                        # rolling mean of the per-session means
+
+Any window is two prefix lookups after a bisect, so queries never rescan
+the history, and `append` of a game to the latest (or a new) session
+only touches the last prefix row. Values are summed per metric with
+their own counts, so NaN values are skipped like `mean()` does.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+
+ALL = "All"
+
+class _Track:
+    """Prefix sums for one location; row k covers sessions [0, k)."""
+    __slots__ = ("dates", "sums", "counts", "means", "gaps", "n")
+
+    def __init__(self, m: int, cap: int = 64):
+        self.dates = []
+        self.n = 0
+        # sums/counts of the values; means: of the per-session means,
+        # gaps: sessions whose mean is NaN (no values for the metric)
+        self.sums, self.counts, self.means, self.gaps = (
+            np.zeros((cap + 1, m)) for _ in range(4))
+
+    def _grow(self):
+        if self.n + 1 >= len(self.sums):
+            for name in ("sums", "counts", "means", "gaps"):
+                a = getattr(self, name)
+                setattr(self, name, np.vstack([a, np.zeros_like(a)]))
+
+    def _close(self, k: int):
+        """Recompute the mean prefixes of session k from its sums."""
+        s = self.sums[k + 1] - self.sums[k]
+        c = self.counts[k + 1] - self.counts[k]
+        empty = c == 0
+        self.means[k + 1] = self.means[k] + np.where(empty, 0.0, s / np.where(empty, 1, c))
+        self.gaps[k + 1] = self.gaps[k] + empty
+
+    def add(self, date, values: np.ndarray, counts: np.ndarray):
+        if self.n and date == self.dates[-1]:
+            k = self.n - 1
+        elif not self.n or date > self.dates[-1]:
+            self._grow()
+            k, self.n = self.n, self.n + 1
+            self.dates.append(date)
+            self.sums[self.n], self.counts[self.n] = self.sums[k], self.counts[k]
+        else:
+            # an older session: rebuild the prefixes from there (rare)
+            self._insert(date, values, counts)
+            return
+        self.sums[k + 1] += values
+        self.counts[k + 1] += counts
+        self._close(k)
+
+    def _insert(self, date, values, counts):
+        k = bisect_left(self.dates, date)
+        per_s = np.diff(self.sums[:self.n + 1], axis=0)
+        per_c = np.diff(self.counts[:self.n + 1], axis=0)
+        if k < self.n and self.dates[k] == date:
+            per_s[k] += values
+            per_c[k] += counts
+        else:
+            self.dates.insert(k, date)
+            per_s = np.insert(per_s, k, values, axis=0)
+            per_c = np.insert(per_c, k, counts, axis=0)
+        self.load(self.dates, per_s, per_c)
+
+    def load(self, dates, sums: np.ndarray, counts: np.ndarray):
+        """Replace the track with per-session sums/counts (sessions in date order)."""
+        self.dates, self.n = list(dates), len(dates)
+        m = sums.shape[1]
+        cap = max(64, 2 * self.n)
+        self.sums, self.counts, self.means, self.gaps = (
+            np.zeros((cap + 1, m)) for _ in range(4))
+        self.sums[1:self.n + 1] = np.cumsum(sums, axis=0)
+        self.counts[1:self.n + 1] = np.cumsum(counts, axis=0)
+        empty = counts == 0
+        means = np.where(empty, 0.0, sums / np.where(empty, 1, counts))
+        self.means[1:self.n + 1] = np.cumsum(means, axis=0)
+        self.gaps[1:self.n + 1] = np.cumsum(empty, axis=0)
+
+    def span(self, sessions=None, days=None, start=None, end=None) -> tuple[int, int]:
+        """Session index range [lo, hi) of the window."""
+        hi = self.n if end is None else bisect_right(self.dates, end)
+        lo = 0 if start is None else bisect_left(self.dates, start)
+        if sessions is not None:
+            lo = max(lo, hi - sessions)
+        if days is not None and hi:
+            lo = max(lo, bisect_left(self.dates, self.dates[hi - 1] - timedelta(days=days - 1)))
+        return lo, min(max(lo, hi), self.n)
+
+class RollingStats:
+    """Windowed means of `metrics` over sessions, for any location or all of them."""
+
+    def __init__(self, metrics: list[str]):
+        self.metrics = list(metrics)
+        self._tracks = {ALL: _Track(len(self.metrics))}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, metrics: list[str], date: str = "Date",
+                   location: str | None = "Location") -> "RollingStats":
+        """Build from one row per game (or event) in a single grouped pass."""
+        stats = cls(metrics)
+        df = df.dropna(subset=[date])
+        keys = [(ALL, [date])]
+        if location and location in df:
+            keys.append((None, [location, date]))
+        for name, by in keys:
+            grouped = df.groupby(by, observed=True, sort=True)[stats.metrics]
+            sums, counts = grouped.sum(), grouped.count()
+            if name == ALL:
+                stats._tracks[ALL].load(sums.index, sums.to_numpy(float), counts.to_numpy(float))
+                continue
+            for loc, s in sums.groupby(level=0, observed=True):
+                track = stats._tracks.setdefault(str(loc), _Track(len(stats.metrics)))
+                c = counts.loc[s.index]
+                track.load(s.index.get_level_values(1), s.to_numpy(float), c.to_numpy(float))
+        return stats
+
+    def append(self, date, location, values: dict):
+        """Add one game's metrics to its session: O(1) for the latest or a new date."""
+        v = np.array([values.get(m, np.nan) for m in self.metrics], dtype=float)
+        known = ~np.isnan(v)
+        v, c = np.where(known, v, 0.0), known.astype(float)
+        for loc in (ALL, None if location is None else str(location)):
+            if loc is not None:
+                self._tracks.setdefault(loc, _Track(len(self.metrics))).add(date, v, c)
+
+    @property
+    def locations(self) -> list[str]:
+        return [loc for loc in self._tracks if loc != ALL]
+
+    def _track(self, location) -> _Track:
+        return self._tracks.get(ALL if location in (None, ALL) else str(location),
+                                _Track(len(self.metrics)))
+
+    def mean(self, location=ALL, sessions: int | None = None, days: int | None = None,
+             start=None, end=None) -> pd.Series:
+        """
+        Mean of each metric over the values in the window: the last
+        `sessions` sessions and/or the last `days` days up to `end`, never
+        before `start`. No limits: every session in [start, end].
+        """
+        t = self._track(location)
+        lo, hi = t.span(sessions, days, start, end)
+        s, c = t.sums[hi] - t.sums[lo], t.counts[hi] - t.counts[lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(s / c, index=self.metrics)
+
+    def daily(self, location=ALL, start=None, end=None) -> pd.DataFrame:
+        """Per-session means, indexed by date."""
+        t = self._track(location)
+        lo, hi = t.span(start=start, end=end)
+        s = np.diff(t.sums[lo:hi + 1], axis=0)
+        c = np.diff(t.counts[lo:hi + 1], axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame(s / c, index=pd.Index(t.dates[lo:hi], name="Date"),
+                                columns=self.metrics)
+
+    def moving(self, n: int, location=ALL, start=None, end=None) -> pd.DataFrame:
+        """
+        Rolling mean of the per-session means over `n` sessions, like
+        `daily(...).rolling(n).mean()`: NaN until n sessions are in, or
+        when one of them has no values.
+        """
+        t = self._track(location)
+        lo, hi = t.span(start=start, end=end)
+        k = np.arange(lo + 1, hi + 1)
+        first = np.maximum(k - n, lo)
+        out = (t.means[k] - t.means[first]) / n
+        bad = (k - n < lo)[:, None] | (t.gaps[k] - t.gaps[first] > 0)
+        return pd.DataFrame(np.where(bad, np.nan, out),
+                            index=pd.Index(t.dates[lo:hi], name="Date"), columns=self.metrics)
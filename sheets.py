@@ -1,80 +1,234 @@
+import threading
+import time
 import streamlit as st
 import gspread
 from gspread_dataframe import set_with_dataframe
 import pandas as pd
-from result_ocr.ocr import compute_bowling_stats_from_string  # or wherever you put it
+from cache import invalidate
+import facts
+import write_queue
 from google.oauth2.service_account import Credentials
 
-def connect_to_workbook() -> gspread.Spreadsheet:
-    creds_info = st.secrets["gcp_service_account"]
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = Credentials.from_service_account_info(creds_info, scopes=scopes)
+WORKBOOK = "v4_resources"
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# Sheets round-trips made by the current script run (one thread per session)
+_render = threading.local()
+
+def _count_call(response, *args, **kwargs):
+    _render.calls = getattr(_render, "calls", 0) + 1
+
+def begin_render():
+    """Reset the per-render API call counter; call at the top of the app."""
+    _render.calls = 0
+
+def api_calls() -> int:
+    """Sheets API requests issued since the last `begin_render()`."""
+    return getattr(_render, "calls", 0)
+
+@st.cache_resource(show_spinner=False)
+def _client() -> gspread.Client:
+    """
+    One authorised client per process, shared by every rerun and session.
+    gspread's AuthorizedSession refreshes the service-account token itself
+    when it expires, so the cached client never has to be rebuilt.
+    """
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"], scopes=SCOPES
+    )
     client = gspread.authorize(creds)
-    return client.open("v4_resources")
+    session = getattr(client, "http_client", client).session
+    session.hooks["response"].append(_count_call)
+    return client
+
+@st.cache_resource(show_spinner=False)
+def connect_to_workbook() -> gspread.Spreadsheet:
+    """
+    Opens the workbook once. Set `[sheets] workbook_key` in secrets to open
+    by key and skip the Drive search that opening by name costs.
+    """
+    key = st.secrets.get("sheets", {}).get("workbook_key")
+    client = _client()
+    return client.open_by_key(key) if key else client.open(WORKBOOK)
+
+@st.cache_resource(show_spinner=False)
+def _worksheet(name: str) -> gspread.Worksheet:
+    return connect_to_workbook().worksheet(name)
+
+def reset_connection():
+    """Drop the cached client and handles, e.g. after an auth error."""
+    for fn in (_client, connect_to_workbook, _worksheet):
+        fn.clear()
 
 def get_session_sheet():
-    return connect_to_workbook().worksheet("Bowling")
+    return _worksheet("Bowling")
 
 def get_ground_truth_sheet():
-    return connect_to_workbook().worksheet("Bowling-full")
+    return _worksheet("Bowling-full")
+
+def _append(name: str, rows: list):
+    _worksheet(name).append_rows(rows, value_input_option="USER_ENTERED")
+    invalidate(name)
+
+def flush_writes(force: bool = False) -> int:
+    """
+    Send queued rows if the queue is due (or `force`); returns rows sent.
+    Also drains anything left in the journal by a previous run. Failures
+    are shown as a warning instead of breaking the render.
+    """
+    try:
+        return write_queue.flush(_append, force=force)
+    except write_queue.Parked as e:
+        st.warning(f"⚠️ {e}. They were set aside; re-queue them from the sidebar.")
+    except Exception as e:  # quota/network: the rows stay queued, the page still renders
+        st.warning(f"⚠️ Upload failed, queued rows will be retried: {e}")
+    return 0
 
 def push_session_data(df):
     """
-    Appends the rows of df to the bottom of the Bowling sheet,
+    Queues the rows of df for the bottom of the Bowling sheet,
     leaving the existing data intact.
     """
-    sheet = get_session_sheet()
     # Convert DataFrame to list-of-lists
-    rows = df.values.tolist()
-    # Append under existing data
-    sheet.append_rows(rows, value_input_option="USER_ENTERED")
+    write_queue.enqueue("Bowling", df.values.tolist())
+    flush_writes()
 
 def push_ground_truth(df):
     """
-    Appends the rows of df to the bottom of the Bowling-full sheet.
+    Queues the rows of df for the bottom of the Bowling-full sheet and
+    records their game facts.
+    """
+    write_queue.enqueue("Bowling-full", df.values.tolist())
+    facts.upsert(df)
+    flush_writes()
+
+AGG_COLS = ['Spares','Strikes','Pins','Total']
+KEY_COLS = ['Date','Location','Game']
+RECONCILE_EVERY = 60 * 60  # seconds between full reconciles
+
+@st.cache_resource(show_spinner=False)
+def _sync_state() -> dict:
+    """
+    Process-wide high-water marks for the incremental sync: the last sheet
+    row already seen in each worksheet, their headers, and the
+    (Date, Location, Game) keys already present in Bowling.
     """
-    sheet = get_ground_truth_sheet()
-    rows = df.values.tolist()
-    sheet.append_rows(rows, value_input_option="USER_ENTERED")
+    return {"lock": threading.Lock(), "reconciled_at": 0.0,
+            "full_row": 1, "sess_row": 1, "full_cols": None, "sess_cols": None,
+            "keys": set()}
+
+def _key(date, loc, game) -> tuple:
+    return (str(date), str(loc), str(game))
+
+def _norm_dates(dates: pd.Series) -> pd.Series:
+    return pd.to_datetime(dates, dayfirst=True).dt.strftime('%Y/%m/%d')
+
+def _rows_after(sheet, row: int, cols: list) -> pd.DataFrame:
+    """Rows strictly below sheet row `row`, as a DataFrame with the given header."""
+    last = gspread.utils.rowcol_to_a1(1, len(cols)).rstrip("0123456789")
+    values = sheet.get_values(f"A{row + 1}:{last}")
+    return pd.DataFrame(values).reindex(columns=range(len(cols))).set_axis(cols, axis=1)
 
-def sync_aggregates_from_full():
+def sync_aggregates_from_full(full: bool = False):
     """
-    Reads every row in Bowling-full, computes its (Total, Pins, Strikes, Spares), 
-    and appends the new ones to the Bowling sheet.
+    Appends the (Total, Pins, Strikes, Spares) of new Bowling-full games to
+    the Bowling sheet. Normally only rows past the last synced row are read
+    and scored; a full reconcile (also fixing up rows edited after they were
+    synced) runs on the first call, every RECONCILE_EVERY seconds, or when
+    `full=True`.
+    """
+    state = _sync_state()
+    with state["lock"]:
+        if full or state["full_cols"] is None or \
+                time.time() - state["reconciled_at"] > RECONCILE_EVERY:
+            _reconcile(state)
+        else:
+            _sync_incremental(state)
+
+def _sync_incremental(state: dict):
+    # 1) New Bowling rows (e.g. pushed straight from the OCR tab) only extend the key set
+    sess = _rows_after(get_session_sheet(), state["sess_row"], state["sess_cols"])
+    if not sess.empty:
+        state["sess_row"] += len(sess)
+        state["keys"].update(map(_key, _norm_dates(sess['Date']), sess['Location'], sess['Game']))
+
+    # 2) Only the Bowling-full rows past the watermark get scored
+    new = _rows_after(get_ground_truth_sheet(), state["full_row"], state["full_cols"])
+    if new.empty:
+        return
+    state["full_row"] += len(new)
+    # scored once: the same facts feed the aggregates and the facts table
+    new[['Total','Pins','Strikes','Spares']] = (
+        facts.upsert(new)[['Total','Pins','Strikes','Spares']].to_numpy()
+    )
+    keys = list(map(_key, new['Date'], new['Location'], new['Game']))
+    to_add = new[[k not in state["keys"] for k in keys]]
+    if to_add.empty:
+        return
+    rows = to_add[KEY_COLS + AGG_COLS].values.tolist()
+    get_session_sheet().append_rows(rows, value_input_option='USER_ENTERED')
+    state["keys"].update(keys)
+    invalidate("Bowling")
+
+def _reconcile(state: dict):
+    """
+    Reads every row in Bowling-full, computes its (Total, Pins, Strikes, Spares),
+    appends the new ones to the Bowling sheet and rewrites any aggregates
+    that no longer match their game string. Resets the watermarks.
     """
     # 1) Read full detail sheet
     full = get_ground_truth_sheet().get_all_records()
     df_full = pd.DataFrame(full)
     if df_full.empty:
         return
+    full_cols = list(df_full.columns)
 
-    # 2) Compute stats from the game string
+    # 2) Compute stats from the game string (rebuilding the facts table with them)
     df_full[['Total','Pins','Strikes','Spares']] = (
-        df_full['Game String']
-          .apply(compute_bowling_stats_from_string)
-          .apply(pd.Series)
+        facts.rebuild(df_full)[['Total','Pins','Strikes','Spares']].to_numpy()
     )
 
     # 3) Read existing session sheet
-    sess = pd.DataFrame(get_session_sheet().get_all_records())
+    sheet = get_session_sheet()
+    sess = pd.DataFrame(sheet.get_all_records())
     # Normalize date formats if needed
-    sess['Date'] = pd.to_datetime(sess['Date'], dayfirst=True).dt.strftime('%Y/%m/%d')
-    
+    sess['Date'] = _norm_dates(sess['Date'])
+    sess['_row'] = range(2, len(sess) + 2)
+
     # 4) Find rows in full not already in sess by (Date, Location, Game)
     merged = df_full.merge(
-        sess[['Date','Location','Game']], 
-        on=['Date','Location','Game'], 
+        sess[KEY_COLS + AGG_COLS + ['_row']],
+        on=KEY_COLS, suffixes=('', '_sess'),
         how='left', indicator=True
     )
     to_add = merged[merged['_merge']=='left_only']
 
-    if to_add.empty:
-        return  # nothing new
+    # 5) Rows edited after they were synced: rewrite their aggregate cells
+    synced = merged[merged['_merge']=='both']
+    updates = []
+    for col in AGG_COLS:
+        stale = synced[pd.to_numeric(synced[f'{col}_sess'], errors='coerce') != synced[col]]
+        c = sess.columns.get_loc(col) + 1
+        updates += [{"range": gspread.utils.rowcol_to_a1(int(r), c), "values": [[int(v)]]}
+                    for r, v in zip(stale['_row'], stale[col])]
+    if updates:
+        sheet.batch_update(updates, value_input_option='USER_ENTERED')
 
-    # 5) Append only the aggregate columns
-    rows = to_add[['Date','Location','Game','Spares','Strikes','Pins','Total']].values.tolist()
-    sheet = get_session_sheet()
-    sheet.append_rows(rows, value_input_option='USER_ENTERED')
+    # 6) Append only the aggregate columns
+    if not to_add.empty:
+        rows = to_add[KEY_COLS + AGG_COLS].values.tolist()
+        sheet.append_rows(rows, value_input_option='USER_ENTERED')
+    if updates or not to_add.empty:
+        invalidate("Bowling")
+
+    state.update(
+        reconciled_at=time.time(),
+        # appended rows are picked up (and ignored) by the next incremental read
+        full_row=len(df_full) + 1, sess_row=len(sess) + 1,
+        full_cols=full_cols, sess_cols=list(sess.columns[:-1]),
+        keys=set(map(_key, sess['Date'], sess['Location'], sess['Game']))
+             | set(map(_key, to_add['Date'], to_add['Location'], to_add['Game'])),
+    )
@@ -4,8 +4,8 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy import stats
-from data import load_sessions, filter_sessions, format_avg, comparison_emoji
-from viz import plot_hist_with_normal, plot_kde
+from data import load_sessions, load_rolling, load_cube, load_pbs, format_avg, comparison_emoji
+from viz import plot_binned_with_normal, plot_kde
 
 def stats_tabs():
     df = load_sessions()
@@ -14,7 +14,9 @@ def stats_tabs():
     dmin, dmax = df.Date.min(), df.Date.max()
     start   = st.sidebar.date_input("Start Date", dmin)
     end     = st.sidebar.date_input("End Date", dmax)
-    filt    = filter_sessions(df, start, end, loc)
+    # filters are answered from (Date, Location) cells, not by masking every game
+    cube    = load_cube()
+    sel     = dict(start=start, end=end, location=loc)
 
     # Create four sub-tabs
     tab_trends, tab_dist, tab_summary, tab_pb = st.tabs([
@@ -27,7 +29,7 @@ def stats_tabs():
     # --- Tab 1: Trends ---
     with tab_trends:
         st.subheader("Time Series Trends")
-        avg_by_date = filt.groupby("Date")[["Spares","Strikes","Pins","Total"]].mean()
+        avg_by_date = cube.by_date(**sel)[["Spares","Strikes","Pins","Total"]]
         dates = avg_by_date.index
 
         col1, col2 = st.columns(2)
@@ -55,33 +57,33 @@ def stats_tabs():
     # --- Tab 2: Distributions ---
     with tab_dist:
         st.subheader("Distribution of Total Scores")
+        counts, edges = cube.histogram(**sel)
         col1, col2 = st.columns(2)
         # KDE
         with col1:
-            fig_kde = plot_kde(filt["Total"])
+            fig_kde = plot_kde((edges[:-1] + edges[1:]) / 2, weights=counts)
             st.pyplot(fig_kde)
         # Histogram + Normal
         with col2:
-            fig_hist, mu, sigma = plot_hist_with_normal(filt["Total"])
+            mu, sigma = cube.mean(**sel)["Total"], cube.std(**sel)["Total"]
+            fig_hist = plot_binned_with_normal(counts, edges, mu, sigma)
             st.pyplot(fig_hist)
 
     # --- Tab 3: Summary Statistics ---
     with tab_summary:
         st.subheader("📋 Key Statistics & Personal Bests")
         # 1) Basic quintiles table
-        desc = filt["Total"].describe()[["min","25%","50%","75%","max"]]
+        desc = cube.describe(**sel)
         summary_df = pd.DataFrame(desc.rename({
             "min":"Min","25%":"Q1","50%":"Median","75%":"Q3","max":"Max"
         })).T
         st.table(summary_df)
 
-        # 2) Moving averages: 5MA vs 10MA
-        dates = filt["Date"].drop_duplicates().sort_values(ascending=False)
-        last5  = dates.head(5)
-        last10 = dates.head(10)
-        overall = filt[["Spares","Strikes","Pins","Total"]].mean()
-        avg5    = filt[filt["Date"].isin(last5)][["Spares","Strikes","Pins","Total"]].mean()
-        avg10   = filt[filt["Date"].isin(last10)][["Spares","Strikes","Pins","Total"]].mean()
+        # 2) Moving averages: 5MA vs 10MA (prefix sums per session, no rescans)
+        rolling = load_rolling()
+        overall = rolling.mean(loc, start=start, end=end)
+        avg5    = rolling.mean(loc, sessions=5, start=start, end=end)
+        avg10   = rolling.mean(loc, sessions=10, start=start, end=end)
 
         # Dataframe creation and table
         metrics = ["Spares","Strikes","Pins","Total"]
@@ -97,13 +99,33 @@ def stats_tabs():
     # --- Tab 4: Personal Bests ---
     with tab_pb:
         st.subheader("Personal Bests")
+        pbs = load_pbs()
         pb = []
         for metric, max_possible in zip(
             ["Spares","Strikes","Pins","Total"], [10,12,100,300]
         ):
-            best_val  = df[metric].max()
-            best_date = df[df[metric]==best_val]["Date"].iloc[0].strftime("%d/%m/%Y")
+            best_val, best_date = _in_game(pbs.top(metric, 1, **sel), metric)
             pb.append((metric, f"{best_val} / {max_possible}", best_date))
 
         pb_df = pd.DataFrame(pb, columns=["Metric","Best (out of)","Date"])
-        st.table(pb_df)
\ No newline at end of file
+        st.table(pb_df)
+
+        st.subheader("Streaks")
+        streaks = [("Strikes in a row", *_in_game(pbs.top("StrikeRun", 1, **sel), "StrikeRun"))]
+        for label, name in [("200+ games in a row", "200+"), ("Clean games in a row", "Clean")]:
+            n, first, last = pbs.streak(name, **sel)
+            streaks.append((label, n, f"{first:%d/%m/%Y} - {last:%d/%m/%Y}" if n else "-"))
+        st.table(pd.DataFrame(streaks, columns=["Record","Best","Date"]))
+
+        st.subheader("Top 10 Games")
+        metric = st.selectbox("By", ["Total","Pins","Strikes","Spares"], key="pb_top_metric")
+        top = pbs.top(metric, 10, **sel)
+        top["Date"] = [d.strftime("%d/%m/%Y") for d in top["Date"]]
+        top[metric] = top[metric].astype(int)
+        st.table(top.set_axis(range(1, len(top) + 1)))
+
+def _in_game(best: pd.DataFrame, metric: str) -> tuple[int, str]:
+    """(value, date) of a single-game record, or (0, "-") when nothing matches."""
+    if best.empty:
+        return 0, "-"
+    return int(best[metric].iloc[0]), best["Date"].iloc[0].strftime("%d/%m/%Y")
@@ -0,0 +1,196 @@
+"""
+The per-string scorers that `result_ocr.scoring` replaced, copied verbatim
+from the baseline: the oracle for test_scoring and the "old" side of
+test_game_benchmark.
+"""
+from itertools import accumulate
+
+def string_stats(game_str: str) -> dict:
+    """
+    Safely score a 10‐frame bowling string via the numeric rolls list,
+    avoiding any indexing of the raw string.
+    """
+     # 1) Build full roll list
+    rolls = []
+    for ch in game_str:
+        if ch == "X":
+            rolls.append(10)
+        elif ch == "/":
+            # spare: make up to 10
+            rolls.append(10 - rolls[-1])
+        elif ch in "-F":  # miss or foul
+            rolls.append(0)
+        else:
+            rolls.append(int(ch))
+
+    total, strikes, spares = 0, 0, 0
+    pins_in_frame = 0
+    roll_idx = 0
+
+    # 2) Walk frame by frame
+    for frame in range(1, 11):
+        if game_str[roll_idx] == "X":
+            # Strike frame
+            strikes += 1
+            total += 10
+            # bonus: next two rolls
+            total += rolls[roll_idx + 1] if roll_idx + 1 < len(rolls) else 0
+            total += rolls[roll_idx + 2] if roll_idx + 2 < len(rolls) else 0
+            pins_in_frame += 10
+            roll_idx += 1
+
+        else:
+            # Two‐ball frame (might be spare)
+            first = rolls[roll_idx]
+            second = rolls[roll_idx + 1] if roll_idx + 1 < len(rolls) else 0
+
+            if first + second == 10:
+                # Spare
+                spares += 1
+                total += 10
+                # bonus: next one roll
+                total += rolls[roll_idx + 2] if roll_idx + 2 < len(rolls) else 0
+            else:
+                # Open frame
+                total += first + second
+
+            pins_in_frame += first + second
+            roll_idx += 2
+    return {
+        "Total":    total,
+        "Pins":     pins_in_frame,
+        "Strikes":  strikes,
+        "Spares":   spares
+    }
+
+def framewise(gs: str) -> tuple[list[str], list[int], list[int]]:
+    """
+    Returns (frame_strs, frame_scores, cumulative_scores) for a 10‐frame game string.
+    Frame 10 is the rest of the string.
+    """
+    # build numeric rolls[]
+    rolls = []
+    for ch in gs:
+        if ch == "X":
+            rolls.append(10)
+        elif ch == "/":
+            rolls.append(10 - rolls[-1])
+        elif ch in "-F":
+            rolls.append(0)
+        else:
+            rolls.append(int(ch))
+
+    frame_strs   = []
+    frame_scores = []
+    i = 0  # pointer into the string gs
+    r = 0  # pointer into rolls[]
+
+    for frame in range(1, 11):
+        if frame < 10:
+            # frames 1–9
+            if rolls[r] == 10:
+                # strike
+                seg = "X"
+                score = 10
+                # bonus
+                score += rolls[r+1] if r+1 < len(rolls) else 0
+                score += rolls[r+2] if r+2 < len(rolls) else 0
+                frame_strs.append(seg)
+                frame_scores.append(score)
+                i += 1
+                r += 1
+            else:
+                # two-ball (or spare)
+                seg = gs[i:i+2]
+                first  = rolls[r]
+                second = rolls[r+1] if r+1 < len(rolls) else 0
+                if first + second == 10:
+                    # spare
+                    score = 10 + (rolls[r+2] if r+2 < len(rolls) else 0)
+                else:
+                    score = first + second
+                frame_strs.append(seg)
+                frame_scores.append(score)
+                i += 2
+                r += 2
+        else:
+            # frame 10: everything left
+            seg = gs[i:]
+            # turn seg into numeric list
+            vals = []
+            for ch in seg:
+                if ch == "X":
+                    vals.append(10)
+                elif ch == "/":
+                    vals.append(10 - vals[-1])
+                elif ch in "-F":
+                    vals.append(0)
+                else:
+                    vals.append(int(ch))
+            score = sum(vals)
+            frame_strs.append(seg)
+            frame_scores.append(score)
+            break
+
+    cum_scores = list(accumulate(frame_scores))
+    return frame_strs, frame_scores, cum_scores
+
+
+def frame_list_stats(frames):
+    # Build flat list of roll scores + frame start indices
+    rolls = []
+    frame_starts = []
+    bonus_pins = 0
+    for fr in frames:
+        frame_starts.append(len(rolls))
+        if fr == "X":
+            rolls.append(10)
+        else:
+            # first roll
+            a = fr[0]
+            rolls.append(int(a) if a.isdigit() else 0)
+            # second roll
+            b = fr[1]
+            if b == "/":
+                rolls.append(10 - rolls[-1])
+            else:
+                rolls.append(int(b) if b.isdigit() else 0)
+        # tenth frame can have a third roll
+        if len(fr) == 3:
+            c = fr[2]
+            if c == "X":
+                bonus_pins = 10
+            elif c == "/":
+                bonus_pins = 10 - rolls[-1]
+            else:
+                bonus_pins = (int(c) if c.isdigit() else 0)
+            rolls.append(bonus_pins)
+
+    total_score, strikes, spares = 0, 0, 0
+    for i, fr in enumerate(frames):
+        idx = frame_starts[i]
+        # Strike
+        if fr == "X":
+            strikes += 1
+            total_score += 10
+            # bonus next two rolls
+            if idx+1 < len(rolls): total_score += rolls[idx+1]
+            if idx+2 < len(rolls): total_score += rolls[idx+2]
+        # Spare (but not strike)
+        elif "/" in fr:
+            spares += 1
+            total_score += 10
+            # bonus next one roll
+            if idx+2 < len(rolls): total_score += rolls[idx+2]
+        else:
+            # Open frame or 10th frame leftover
+            # count how many rolls this frame contributed
+            count = 1 if fr=="X" else (2 if len(fr)==2 else 3)
+            total_score += sum(rolls[idx: idx+count])
+
+    return {
+        "Total":    total_score,
+        "Strikes":  strikes,
+        "Spares":   spares,
+        "Pins":     sum(rolls) - bonus_pins
+    }
@@ -0,0 +1,38 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+from cube import Cube, METRICS
+
+def _sessions():
+    return pd.DataFrame({
+        "Date":     [date(2025, 1, 1)] * 3 + [date(2025, 1, 2)] * 2,
+        "Location": ["Kai Tak", "Kai Tak", "Kai Tak", "Mong Kok", "Kai Tak"],
+        "Game":     [1, 2, 3, 1, 1],
+        "Spares":   [3, 4, 2, 5, 1],
+        "Strikes":  [2, 3, 1, 4, 6],
+        "Pins":     [85, 90, 80, 95, 88],
+        "Total":    [150, np.nan, 120, 180, 199],   # a blank Total cell
+    })
+
+def test_blank_total_is_skipped_like_pandas():
+    df = _sessions()
+    cube = Cube.from_frame(df)
+    for loc in ["All", "Kai Tak", "Mong Kok"]:
+        sel = df if loc == "All" else df[df["Location"] == loc]
+        assert cube.count(location=loc) == len(sel)
+        assert np.allclose(cube.mean(location=loc), sel[METRICS].mean(), equal_nan=True)
+        assert np.allclose(cube.std(location=loc), sel[METRICS].std(), equal_nan=True)
+        ref = sel.groupby("Date")[METRICS].mean()
+        assert np.allclose(cube.by_date(location=loc), ref, equal_nan=True)
+    counts, _ = cube.histogram()
+    assert counts.sum() == df["Total"].notna().sum()
+    d = cube.describe(start=date(2025, 1, 1), end=date(2025, 1, 1), location="Kai Tak")
+    assert (d["min"], d["max"]) == (120, 150)
+
+def test_cell_without_any_total():
+    df = _sessions()
+    df.loc[df["Location"] == "Mong Kok", "Total"] = np.nan
+    cube = Cube.from_frame(df)
+    assert np.isnan(cube.mean(location="Mong Kok")["Total"])
+    assert cube.describe(location="Mong Kok").isna().all()
+    assert cube.describe()["max"] == 199
@@ -0,0 +1,55 @@
+import threading
+from datetime import date
+import pandas as pd
+import pytest
+import facts
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(facts, "FACTS", tmp_path / "game_facts.parquet")
+
+def _rows(day: str, location: str, games):
+    return pd.DataFrame({"Date": day, "Location": location, "Game": list(games),
+                         "Game String": "9/X81-7/X9-X8/XX7"})
+
+@pytest.mark.parametrize("days", [
+    ["2025/06/12", "2025/06/13", "2025/04/21"],   # the sync's %Y/%m/%d
+    ["06/12/2025", "06/13/2025", "04/21/2025"],   # the OCR tab's %m/%d/%Y, as in labels.csv
+    ["06/12/2025", "2025/06/13", "04/21/2025"],   # both in one column
+])
+def test_full_dates_are_month_first(days):
+    rows = pd.concat([_rows(d, "Kai Tak", [1]) for d in days], ignore_index=True)
+    got = facts.compute(rows)["Date"].tolist()
+    assert got == [date(2025, 6, 12), date(2025, 6, 13), date(2025, 4, 21)]
+
+def test_bowling_dates_are_day_first_except_year_first():
+    got = facts.parse_dates(["12/06/2025", "13/06/2025", "2025/06/12", "2025-04-21", "", None],
+                            dayfirst=True).tolist()
+    assert got[:4] == [date(2025, 6, 12), date(2025, 6, 13), date(2025, 6, 12), date(2025, 4, 21)]
+    assert pd.isna(got[4]) and pd.isna(got[5])
+
+def test_concurrent_upserts_keep_every_game():
+    def push(location):
+        for game in range(1, 11):
+            facts.upsert(_rows("03/04/2025", location, [game]))
+    threads = [threading.Thread(target=push, args=(loc,)) for loc in ("Kai Tak", "Mong Kok")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stored = facts.read()
+    assert len(stored) == 20
+    assert stored.groupby("Location")["Game"].nunique().to_dict() == {"Kai Tak": 10, "Mong Kok": 10}
+
+def test_upsert_replaces_same_key():
+    facts.upsert(_rows("03/04/2025", "Kai Tak", [1, 2]))
+    facts.upsert(_rows("03/04/2025", "Kai Tak", [2]).assign(**{"Game String": "X" * 12}))
+    stored = facts.read().set_index("Game")
+    assert len(stored) == 2 and stored.loc[2, "Total"] == 300
+
+def test_no_history_gives_an_empty_table():
+    empty = facts.rebuild(pd.DataFrame([]))
+    assert empty.empty and list(empty.columns) == facts.COLUMNS
+    assert list(facts.compute(_rows("03/04/2025", "Kai Tak", [1])).columns) == facts.COLUMNS
+    facts.upsert(_rows("03/04/2025", "Kai Tak", [1]))
+    assert len(facts.read()) == 1
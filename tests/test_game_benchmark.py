@@ -0,0 +1,62 @@
+"""
+Game (result_ocr.scoring) against the per-string scorers it replaced.
+
+    python -m pytest tests/test_game_benchmark.py --benchmark-group-by=group
+"""
+import random
+import pytest
+from bench import synthetic_game
+from result_ocr.scoring import Game
+from legacy_scoring import string_stats, framewise, frame_list_stats
+
+pytest.importorskip("pytest_benchmark")
+
+N_GAMES = 100_000
+
+@pytest.fixture(scope="module")
+def throws():
+    rng = random.Random(0)
+    return [synthetic_game(rng) for _ in range(N_GAMES)]
+
+@pytest.fixture(scope="module")
+def strings(throws):
+    return ["".join(t) for t in throws]
+
+@pytest.fixture(scope="module")
+def frames(throws):
+    return [[t[2 * f] + t[2 * f + 1] for f in range(9)] + ["".join(t[18:])] for t in throws]
+
+@pytest.mark.benchmark(group="construct")
+def test_construct(benchmark, strings):
+    benchmark(lambda: [Game(s) for s in strings])
+
+@pytest.mark.benchmark(group="stats")
+def test_stats_old(benchmark, strings):
+    benchmark(lambda: [string_stats(s) for s in strings])
+
+@pytest.mark.benchmark(group="stats")
+def test_stats_game(benchmark, strings):
+    got = benchmark(lambda: [Game(s).stats() for s in strings])
+    assert got == [string_stats(s) for s in strings]
+
+@pytest.mark.benchmark(group="framewise")
+def test_framewise_old(benchmark, strings):
+    benchmark(lambda: [framewise(s) for s in strings])
+
+@pytest.mark.benchmark(group="framewise")
+def test_framewise_game(benchmark, strings):
+    def run():
+        return [(g.frame_strs, g.frame_scores, g.cumulative) for g in map(Game, strings)]
+    got = benchmark(run)
+    assert got == [framewise(s) for s in strings]
+
+@pytest.mark.benchmark(group="frame-list")
+def test_frame_list_old(benchmark, frames):
+    benchmark(lambda: [frame_list_stats(f) for f in frames])
+
+@pytest.mark.benchmark(group="frame-list")
+def test_frame_list_game(benchmark, frames, strings):
+    # no equality check: the old frame-list scorer misread a 10th frame
+    # starting with X, see test_stats_game for the agreed scores
+    got = benchmark(lambda: [Game.from_frames(f).stats() for f in frames])
+    assert got == [Game(s).stats() for s in strings]
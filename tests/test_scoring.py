@@ -0,0 +1,42 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from result_ocr.scoring import Game, score_games
+from legacy_scoring import string_stats as reference_score
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def _complete(games: list[str]) -> list[str]:
+    """The games the reference can score (some labels stop before the 10th frame)."""
+    out = []
+    for g in games:
+        try:
+            reference_score(g)
+        except (IndexError, ValueError):
+            continue
+        out.append(g)
+    return out
+
+def _labels() -> list[str]:
+    df = pd.read_csv(ROOT / "data" / "labels.csv", dtype=str)
+    throws = df.filter(regex=r"^Frame\d+-\d$").fillna("")
+    return _complete(throws.agg("".join, axis=1).tolist())
+
+def _flattened() -> list[str]:
+    # blank cells were flattened as "nan" and whole-number pins as "8.0"
+    df = pd.read_csv(ROOT / "flattened_games.csv", dtype=str)
+    return _complete(df["gamestring"].str.replace("nan", "")
+                     .str.replace(".0", "", regex=False).tolist())
+
+@pytest.mark.parametrize("games", [_labels(), _flattened()], ids=["labels", "flattened"])
+def test_score_games_matches_reference(games):
+    assert len(games) > 20
+    got = score_games(pd.Series(games))
+    for i, g in enumerate(games):
+        assert got.loc[i, ["Total", "Pins", "Strikes", "Spares"]].to_dict() == reference_score(g), g
+        assert got.loc[i, "Total"] == Game(g).total
+
+def test_non_ascii_glyph_scores_like_game():
+    s = "9/X81-7é/X9-X8/XX7"
+    got = score_games([s])
+    assert got.loc[0, "Total"] == Game(s).total
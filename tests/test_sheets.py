@@ -0,0 +1,107 @@
+"""sheets.py connection caching and per-render call counting, on a fake gspread client."""
+import threading
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("streamlit")
+pytest.importorskip("gspread_dataframe")
+import gspread
+import sheets
+
+class FakeWorksheet:
+    def __init__(self, session, name):
+        self.session, self.title = session, name
+
+    def get_all_values(self):
+        # a real request goes through the AuthorizedSession's response hooks
+        for hook in self.session.hooks["response"]:
+            hook(SimpleNamespace(status_code=200))
+        return [["Date", "Location", "Game"]]
+
+class FakeSpreadsheet:
+    def __init__(self, session):
+        self.session, self.opened = session, []
+
+    def worksheet(self, name):
+        self.opened.append(name)
+        return FakeWorksheet(self.session, name)
+
+class FakeClient:
+    def __init__(self):
+        self.http_client = SimpleNamespace(session=SimpleNamespace(hooks={"response": []}))
+        self.workbook = FakeSpreadsheet(self.http_client.session)
+        self.opens = 0
+
+    def open(self, name):
+        self.opens += 1
+        return self.workbook
+
+    open_by_key = open
+
+@pytest.fixture
+def client(monkeypatch):
+    clients = []
+
+    def authorize(creds):
+        clients.append(FakeClient())
+        return clients[-1]
+
+    monkeypatch.setattr(gspread, "authorize", authorize)
+    monkeypatch.setattr(sheets.Credentials, "from_service_account_info",
+                        staticmethod(lambda info, scopes: object()))
+    monkeypatch.setattr(sheets.st, "secrets", {"gcp_service_account": {}})
+    sheets.reset_connection()
+    yield clients
+    sheets.reset_connection()
+
+def test_workbook_opened_once_per_process(client):
+    for _ in range(3):  # reruns
+        sheets.connect_to_workbook()
+    assert len(client) == 1 and client[0].opens == 1
+
+def test_worksheets_reused_across_reruns(client):
+    first = sheets.get_session_sheet()
+    for _ in range(3):
+        assert sheets.get_session_sheet() is first
+        sheets.get_ground_truth_sheet()
+    assert client[0].workbook.opened == ["Bowling", "Bowling-full"]
+
+def test_reset_connection_reopens(client):
+    sheets.get_session_sheet()
+    sheets.reset_connection()
+    sheets.get_session_sheet()
+    assert len(client) == 2
+
+def test_api_calls_count_only_this_render(client):
+    ws = sheets.get_session_sheet()
+    sheets.begin_render()
+    ws.get_all_values()
+    ws.get_all_values()
+    assert sheets.api_calls() == 2
+
+    # another session's script thread doesn't count towards this render
+    other = threading.Thread(target=ws.get_all_values)
+    other.start()
+    other.join()
+    assert sheets.api_calls() == 2
+
+    sheets.begin_render()  # the next rerun starts from zero
+    assert sheets.api_calls() == 0
+    ws.get_all_values()
+    assert sheets.api_calls() == 1
+
+def test_flush_errors_warn_instead_of_breaking_the_render(tmp_path, monkeypatch):
+    import write_queue
+    monkeypatch.setattr(write_queue, "JOURNAL", tmp_path / "journal.jsonl")
+    monkeypatch.setattr(write_queue, "PARKED", tmp_path / "parked.jsonl")
+    warnings = []
+    monkeypatch.setattr(sheets.st, "warning", warnings.append, raising=False)
+    response = SimpleNamespace(status_code=400, text="",
+                               json=lambda: {"error": {"code": 400, "message": "bad row"}})
+    def reject(name, rows):
+        raise gspread.exceptions.APIError(response)
+    monkeypatch.setattr(sheets, "_append", reject)
+    write_queue.enqueue("Bowling", [["a"]])
+    assert sheets.flush_writes(force=True) == 0
+    assert sheets.flush_writes(force=True) == 0   # parked, so not retried
+    assert len(warnings) == 1 and write_queue.pending() == []
@@ -0,0 +1,74 @@
+import threading
+import time
+from types import SimpleNamespace
+import gspread
+import pytest
+import requests
+import write_queue
+
+def _api_error(status):
+    response = SimpleNamespace(status_code=status, text="",
+                               json=lambda: {"error": {"code": status, "message": ""}})
+    return gspread.exceptions.APIError(response)
+
+@pytest.fixture(autouse=True)
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(write_queue, "JOURNAL", tmp_path / "journal.jsonl")
+    monkeypatch.setattr(write_queue, "PARKED", tmp_path / "parked.jsonl")
+    monkeypatch.setattr(write_queue, "_backoff", {"until": 0.0, "failures": 0})
+
+def _appender(failures):
+    sent = []
+    def append(sheet, rows):
+        if failures:
+            error = failures.pop(0)
+            raise _api_error(error) if isinstance(error, int) else error
+        sent.append((sheet, rows))
+    return append, sent
+
+@pytest.mark.parametrize("error", [429, requests.exceptions.ConnectionError()])
+def test_transient_errors_keep_rows_and_back_off(error):
+    write_queue.enqueue("Bowling", [["a"]])
+    append, sent = _appender([error])
+    with pytest.raises(Exception):
+        write_queue.flush(append, force=True)
+    assert [e["rows"] for e in write_queue.pending()] == [[["a"]]]
+    # no flush until the backoff has passed, without sleeping in the call
+    write_queue.enqueue("Bowling", [["b"]] * write_queue.FLUSH_AT)
+    t = time.perf_counter()
+    assert write_queue.flush(append) == 0
+    assert time.perf_counter() - t < 0.5
+    assert write_queue.flush(append, force=True) == 1 + write_queue.FLUSH_AT
+    assert write_queue.pending() == []
+
+@pytest.mark.parametrize("status", [400, 403, 500, 503])
+def test_rejected_rows_are_parked_not_resent(status):
+    write_queue.enqueue("Bowling", [["a"]])
+    append, sent = _appender([status])
+    with pytest.raises(write_queue.Parked):
+        write_queue.flush(append, force=True)
+    assert write_queue.pending() == []
+    assert [e["rows"] for e in write_queue.parked()] == [[["a"]]]
+    assert write_queue.flush(append, force=True) == 0 and sent == []
+
+    assert write_queue.requeue_parked() == 1
+    assert write_queue.parked() == []
+    assert write_queue.flush(append, force=True) == 1
+    assert sent == [("Bowling", [["a"]])]
+
+def test_enqueue_is_not_blocked_by_a_slow_append():
+    write_queue.enqueue("Bowling", [["a"]])
+    started, release = threading.Event(), threading.Event()
+    def append(sheet, rows):
+        started.set()
+        release.wait(5)
+    flusher = threading.Thread(target=write_queue.flush, args=(append,), kwargs={"force": True})
+    flusher.start()
+    started.wait(5)
+    t = time.perf_counter()
+    write_queue.enqueue("Bowling-full", [["b"]])     # queued while the append is in flight
+    assert time.perf_counter() - t < 0.5
+    assert write_queue.flush(append, force=True) == 0  # another flush is running
+    release.set()
+    flusher.join()
+    assert [e["sheet"] for e in write_queue.pending()] == ["Bowling-full"]
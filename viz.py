@@ -26,9 +26,33 @@ def plot_hist_with_normal(y) -> tuple[plt.Figure, float, float]:
     ax2.legend(loc="upper right")
     return fig, mu, sigma
 
-def plot_kde(y) -> plt.Figure:
+def plot_binned_with_normal(counts, edges, mu: float, sigma: float) -> plt.Figure:
+    """`plot_hist_with_normal` from pre-binned counts (e.g. `Cube.histogram`)."""
+    used = np.flatnonzero(counts)
+    lo, hi = (used[0], used[-1] + 1) if len(used) else (0, 1)
+    # merge buckets into ~20 bars over the range that has games
+    step = max(1, -(-(hi - lo) // 20))
+    starts = np.arange(lo, hi, step)
+    merged = np.add.reduceat(counts, starts)
+    bins = np.r_[edges[starts], edges[min(starts[-1] + step, len(counts))]]
+    fig, ax1 = plt.subplots()
+    ax1.stairs(merged, bins, fill=True, alpha=0.7, color="skyblue", edgecolor="black")
+    ax1.set(title="Histogram with Normal Fit", xlabel="Total Score", ylabel="Frequency")
+    ax2 = ax1.twinx()
+    ax2.plot(
+        bins,
+        stats.norm.pdf(bins, mu, sigma),
+        'k--',
+        label=f"N({mu:.1f}, {sigma:.2f}²)"
+    )
+    ax2.set_ylabel("Density")
+    ax2.legend(loc="upper right")
+    return fig
+
+def plot_kde(y, weights=None) -> plt.Figure:
+    """KDE of `y`; pass bucket centres and `weights` (counts) for binned data."""
     fig, ax = plt.subplots()
-    sns.kdeplot(y, fill=True, ax=ax)
+    sns.kdeplot(x=np.asarray(y), weights=weights, fill=True, ax=ax)
     return fig
 
 def plot_residuals(x, y, label: str, color: str) -> plt.Figure:
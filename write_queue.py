@@ -0,0 +1,142 @@
+"""
+Write-behind queue for the Bowling / Bowling-full appends.
+
+Rows are journalled to disk before anything is sent, so a submitted game
+survives a Streamlit restart. A flush coalesces everything pending into one
+append per worksheet. It never sleeps in the render: after a quota or
+network error the rows stay journalled and flushes pause for an
+exponentially growing backoff. Rows a worksheet rejects for any other
+reason are parked in PARKED until someone re-queues them.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+import gspread
+import requests
+
+JOURNAL = Path(__file__).parent / ".cache" / "write_journal.jsonl"
+PARKED = JOURNAL.with_name("write_parked.jsonl")
+FLUSH_AFTER = 30   # seconds the oldest pending row may wait
+FLUSH_AT = 20      # pending rows that force a flush
+BACKOFF = 1.0      # seconds without flushes after a quota error, doubled per failure
+MAX_BACKOFF = 300
+# Only quota errors are retried: the request was refused, so resending can't
+# duplicate rows. A 5xx may come after the append was applied, and a 4xx
+# will fail again, so those rows are parked rather than resent.
+RETRY_STATUS = {429}
+
+_lock = threading.Lock()      # the journal files
+_sending = threading.Lock()   # one flush at a time; held while talking to Sheets
+_backoff = {"until": 0.0, "failures": 0}
+
+class Parked(Exception):
+    """A worksheet rejected rows; they were moved to PARKED."""
+
+def enqueue(sheet: str, rows: list[list]):
+    """Durably record rows to append to `sheet`."""
+    if not rows:
+        return
+    JOURNAL.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({"sheet": sheet, "rows": rows, "at": time.time()}, default=str)
+    with _lock, open(JOURNAL, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def _read(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        # a torn last line (crash mid-write) never made it to the sheet either
+        return [json.loads(l) for l in f if l.strip().endswith("}")]
+
+def pending() -> list[dict]:
+    """Journal entries not yet written, oldest first."""
+    return _read(JOURNAL)
+
+def parked() -> list[dict]:
+    """Entries a worksheet rejected, each with the error in "reason"."""
+    return _read(PARKED)
+
+def _rewrite(entries: list[dict], path: Path = None):
+    path = path or JOURNAL
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(e, default=str) + "\n" for e in entries)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _drop(batch: list[dict]):
+    """Remove `batch` from the journal, keeping whatever was queued meanwhile."""
+    rest = pending()
+    for e in batch:
+        if e in rest:
+            rest.remove(e)
+    _rewrite(rest)
+
+def _park(batch: list[dict], reason: str):
+    with _lock:
+        _rewrite(parked() + [dict(e, reason=reason) for e in batch], PARKED)
+        _drop(batch)
+
+def requeue_parked() -> int:
+    """Move parked entries back into the journal; returns the rows moved."""
+    with _lock:
+        entries = [{k: v for k, v in e.items() if k != "reason"} for e in parked()]
+        _rewrite(pending() + entries)
+        PARKED.unlink(missing_ok=True)
+    return sum(len(e["rows"]) for e in entries)
+
+def _back_off():
+    n = _backoff["failures"] = _backoff["failures"] + 1
+    _backoff["until"] = time.time() + min(MAX_BACKOFF, BACKOFF * 2 ** (n - 1))
+
+def is_due(entries: list[dict] | None = None) -> bool:
+    entries = pending() if entries is None else entries
+    return bool(entries) and time.time() >= _backoff["until"] and (
+        sum(len(e["rows"]) for e in entries) >= FLUSH_AT
+        or time.time() - entries[0]["at"] >= FLUSH_AFTER
+    )
+
+def flush(append, force: bool = False) -> int:
+    """
+    Send pending rows with one append(sheet, rows) call per worksheet, in the
+    order the worksheets were first queued. Returns the number of rows sent,
+    0 when nothing is due or another session is already flushing.
+    Stops at the first worksheet that fails and re-raises: quota and network
+    errors keep its rows journalled (and start a backoff), any other API
+    error parks them and raises `Parked`.
+    """
+    if not _sending.acquire(blocking=False):
+        return 0
+    try:
+        with _lock:
+            entries = pending()
+        if not entries or not (force or is_due(entries)):
+            return 0
+        sent = 0
+        for sheet in dict.fromkeys(e["sheet"] for e in entries):
+            batch = [e for e in entries if e["sheet"] == sheet]
+            rows = [r for e in batch for r in e["rows"]]
+            try:
+                append(sheet, rows)
+            except gspread.exceptions.APIError as e:
+                status = getattr(e.response, "status_code", None)
+                if status in RETRY_STATUS:
+                    _back_off()
+                    raise
+                _park(batch, f"{status}: {e}")
+                raise Parked(f"{sheet} rejected {len(rows)} rows ({status}: {e})") from e
+            except (requests.exceptions.RequestException, OSError):
+                _back_off()
+                raise
+            with _lock:
+                _drop(batch)
+            sent += len(rows)
+        _backoff.update(until=0.0, failures=0)
+        return sent
+    finally:
+        _sending.release()